@@ -77,6 +77,8 @@ class Game:
     BoardLeft = 0
     BoardRight = 0
 
+    Hints = None  # hint_service.HintService, set up in main
+
     def FirstToPlay():  # This function is only for the round where the person who has | 6 I 6 | plays first
 
         Game.WhosTurn = Domino.Tile[27].Assigned
@@ -102,8 +104,19 @@ class Game:
         print( f" It is {Player.Who[who].Name}'s to Play ")
         print()
         Domino.DisplayPlayerTiles(who)
-        
-        TileToPlay = input("Insert Tile Number To Play: ")
+
+        # The hint service works on the position while the player thinks
+        Position = Game.Position(who)
+        Game.Hints.start_thinking(Position)
+
+        TileToPlay = input("Insert Tile Number To Play (h for a hint): ")
+
+        while TileToPlay.strip().lower() == "h":
+            for Line in format_hints(Game.Hints.hints(Position, 50)):
+                print(Line)
+            TileToPlay = input("Insert Tile Number To Play (h for a hint): ")
+
+        Game.Hints.stop_thinking()
 
         # For now we just enter a blank space to pass or simply hit enter
         if TileToPlay.isspace() or len(TileToPlay) == 0:
@@ -119,6 +132,22 @@ class Game:
         
         
 
+    def Position(who):
+
+        # What the player can see, in the form the hint service wants
+        # Every tile gets dealt, so an unassigned tile is on the board
+
+        Hand = 0
+        Played = 0
+        for i in range(28):
+            if Domino.Tile[i].Assigned == who:
+                Hand |= 1 << i
+            elif Domino.Tile[i].Assigned == 0:
+                Played |= 1 << i
+
+        Counts = tuple(Player.Who[(who - 1 + n) % 4 + 1].TilesAssigned for n in range(4))
+        return Position(6, Hand, Played, Game.BoardLeft, Game.BoardRight, Counts)
+
     def DisplayBoard():
 
         print( "  ----------------------------------------------------------------------------------------------------------------------------------------------------------------")
@@ -228,15 +257,24 @@ class Game:
 # Couldnt figure out why the code wasnt working for like a solid 30mins
 # Coding can be stressful
 
-Domino.GenerateTiles()
+# Only play when run as a script, importing this file just defines the classes
+
+if __name__ == "__main__":
+
+    from hint_service import HintService, Position, format_hints
+
+    # Hints for how this version places tiles, the player only picks the tile
+    Game.Hints = HintService(rule="v0.05")
+
+    Domino.GenerateTiles()
 
 
-Player.Who.append(Player("Kalm", 0))
-Player.Who.append(Player("Claire", 0))
-Player.Who.append(Player("Akasha", 0))
-Player.Who.append(Player("Shiva", 0))
+    Player.Who.append(Player("Kalm", 0))
+    Player.Who.append(Player("Claire", 0))
+    Player.Who.append(Player("Akasha", 0))
+    Player.Who.append(Player("Shiva", 0))
 
-Domino.AssignTiles()
+    Domino.AssignTiles()
 
-Game.FirstToPlay()
+    Game.FirstToPlay()
 
@@ -5,6 +5,8 @@ Script to analyze the user's Tile0.png example and understand the correct tile f
 from PIL import Image
 import os
 
+from domino_game import MAX_PIP, tile_count
+
 def analyze_tile_example():
     """Analyze the user's Tile0.png to understand correct format"""
     
@@ -51,7 +53,7 @@ def analyze_tile_example():
         print(f"Error analyzing tile: {e}")
         return None, None
 
-def create_manual_cropping_guide():
+def create_manual_cropping_guide(max_pip=MAX_PIP):
     """Create a guide for manual tile positioning"""
     
     tile_width, tile_height = analyze_tile_example()
@@ -66,12 +68,12 @@ def create_manual_cropping_guide():
     print("3. Use those coordinates to crop each tile individually")
     
     print(f"\nEach tile should be approximately {tile_width} x {tile_height} pixels")
-    print("We need to locate all 28 domino tiles (0-0 through 6-6)")
+    print(f"We need to locate all {tile_count(max_pip)} domino tiles (0-0 through {max_pip}-{max_pip})")
     
     # Generate the list of all domino tiles we need
     domino_tiles = []
-    for i in range(7):
-        for j in range(i, 7):
+    for i in range(max_pip + 1):
+        for j in range(i, max_pip + 1):
             domino_tiles.append((i, j))
     
     print(f"\nTiles we need to find and crop:")
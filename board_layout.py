@@ -0,0 +1,183 @@
+"""
+Snake layout for the line of play
+Works out where each tile goes as it is added to either end of the board.
+Each end grows outwards from the first tile and turns a corner when it reaches
+the edge (the right end turns down, the left end turns up), doubles are placed
+crosswise. Every move is an O(1) update, nothing already placed is moved.
+
+The layout only deals in rectangles, so the console and the Kivy board both
+use it with their own tile sizes
+"""
+
+from collections import namedtuple
+
+# x, y is the bottom-left corner (y grows upwards). first and second are the
+# pip numbers in reading order: left to right, or top to bottom when vertical
+Placement = namedtuple('Placement', ['x', 'y', 'width', 'height', 'first', 'second', 'vertical', 'side'])
+
+# Tile size and board width in console characters, see render_text()
+CONSOLE_TILE_LENGTH = 6
+CONSOLE_TILE_BREADTH = 2
+
+
+class BoardArm:
+    def __init__(self, direction, turn):
+        self.end_x = 0
+        self.end_y = 0
+        self.direction = direction  # +1 heading right, -1 heading left
+        self.turn = turn            # +1 turns up at the edge, -1 turns down
+        self.after_corner = False
+
+
+class SnakeLayout:
+    def __init__(self, tile_length=208, tile_breadth=115, max_width=1600):
+        self.tile_length = tile_length
+        self.tile_breadth = tile_breadth
+        self.half_width = max_width / 2
+        self.placements = []
+        self.left_arm = BoardArm(-1, 1)
+        self.right_arm = BoardArm(1, -1)
+        self.bounds = None
+
+    def add_tile(self, left, right, side):
+        """
+        Place a tile the way it reads on the board (left number first) at
+        side "start", "left" or "right", and return its Placement
+        """
+        if side == "start":
+            placement = self.place_start(left, right)
+        elif side == "left":
+            # The right number of a tile added on the left touches the chain
+            placement = self.place_on_arm(self.left_arm, right, left, side)
+        elif side == "right":
+            placement = self.place_on_arm(self.right_arm, left, right, side)
+        else:
+            raise ValueError(f"Unknown board side: {side}")
+
+        self.placements.append(placement)
+        self.extend_bounds(placement)
+        return placement
+
+    def place_start(self, left, right):
+        """Centre the first tile on the origin"""
+        length, breadth = self.tile_length, self.tile_breadth
+        if left == right:
+            placement = Placement(-breadth / 2, -length / 2, breadth, length, left, right, True, "start")
+            half = breadth / 2
+        else:
+            placement = Placement(-length / 2, -breadth / 2, length, breadth, left, right, False, "start")
+            half = length / 2
+
+        self.left_arm.end_x, self.left_arm.end_y = -half, 0
+        self.right_arm.end_x, self.right_arm.end_y = half, 0
+        return placement
+
+    def place_on_arm(self, arm, near, far, side):
+        """Add a tile to the end of one arm, near is the number touching the chain"""
+        length, breadth = self.tile_length, self.tile_breadth
+        # A crosswise double straight after a corner would run into the corner tile
+        double = near == far and not arm.after_corner
+        arm.after_corner = False
+        along = breadth if double else length
+
+        # Keep a tile breadth free at the edge for the corner tile
+        if abs(arm.end_x + arm.direction * along) > self.half_width - breadth:
+            return self.place_corner(arm, near, far, side)
+
+        x = arm.end_x if arm.direction > 0 else arm.end_x - along
+        arm.end_x += arm.direction * along
+
+        if double:
+            return Placement(x, arm.end_y - length / 2, breadth, length, near, far, True, side)
+
+        first, second = (near, far) if arm.direction > 0 else (far, near)
+        return Placement(x, arm.end_y - breadth / 2, length, breadth, first, second, False, side)
+
+    def place_corner(self, arm, near, far, side):
+        """
+        Stand a tile up past the end of the arm and send the arm back the
+        other way one tile length further down (or up). Rows are a tile
+        length apart so doubles on neighbouring rows never overlap
+        """
+        length, breadth = self.tile_length, self.tile_breadth
+
+        x = arm.end_x if arm.direction > 0 else arm.end_x - breadth
+        if arm.turn < 0:
+            y = arm.end_y + breadth / 2 - length
+            first, second = near, far
+        else:
+            y = arm.end_y - breadth / 2
+            first, second = far, near
+
+        arm.end_x += arm.direction * breadth
+        arm.end_y += arm.turn * length
+        arm.direction = -arm.direction
+        arm.after_corner = True
+        return Placement(x, y, breadth, length, first, second, True, side)
+
+    def extend_bounds(self, placement):
+        x0, y0 = placement.x, placement.y
+        x1, y1 = x0 + placement.width, y0 + placement.height
+        if self.bounds is None:
+            self.bounds = [x0, y0, x1, y1]
+        else:
+            bounds = self.bounds
+            bounds[0] = min(bounds[0], x0)
+            bounds[1] = min(bounds[1], y0)
+            bounds[2] = max(bounds[2], x1)
+            bounds[3] = max(bounds[3], y1)
+
+    def bounding_box(self):
+        """Get (x0, y0, x1, y1) around every placed tile, for auto-zoom"""
+        if self.bounds is None:
+            return (0, 0, 0, 0)
+        return tuple(self.bounds)
+
+
+def console_layout(width=100, max_pip=6):
+    """Create a layout sized in console characters for render_text()"""
+    # Two digit pips (double-twelve sets) need a wider tile
+    tile_length = CONSOLE_TILE_LENGTH if max_pip < 10 else CONSOLE_TILE_LENGTH + 2
+    return SnakeLayout(tile_length, CONSOLE_TILE_BREADTH, width - tile_length)
+
+
+def render_text(layout, width=100):
+    """
+    Draw a console_layout() as text lines centred in width columns.
+    One x unit is one character and one row is two y units
+    """
+    if not layout.placements:
+        return []
+
+    def top_row(y):
+        # Highest row whose centre (2 * row) is below y
+        return int(-(-y // 2)) - 1
+
+    def bottom_row(y):
+        # Lowest row whose centre is above y
+        return int(y // 2) + 1
+
+    digits = (layout.tile_length - 4) // 2
+
+    x0, y0, x1, y1 = layout.bounding_box()
+    columns = int(x1 - x0)
+    first_row = top_row(y1)
+    grid = [[' '] * columns for _ in range(first_row - bottom_row(y0) + 1)]
+
+    def write(row, column, text):
+        line = grid[first_row - row]
+        for offset, char in enumerate(text):
+            line[column + offset] = char
+
+    for tile in layout.placements:
+        column = int(tile.x - x0)
+        if tile.vertical:
+            rows = range(top_row(tile.y + tile.height), bottom_row(tile.y) - 1, -1)
+            texts = [f"{tile.first:>{digits}}"] + ["-"] * (len(rows) - 2) + [f"{tile.second:>{digits}}"]
+            for row, text in zip(rows, texts):
+                write(row, column, text)
+        else:
+            write(bottom_row(tile.y), column, f"[{tile.first:>{digits}}|{tile.second:<{digits}}]")
+
+    padding = ' ' * max(0, (width - columns) // 2)
+    return [padding + ''.join(line).rstrip() for line in grid]
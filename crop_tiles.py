@@ -6,7 +6,9 @@ This will create separate image files for each domino tile (0-0 through 6-6)
 from PIL import Image
 import os
 
-def crop_domino_tiles():
+from domino_game import MAX_PIP, tile_count
+
+def crop_domino_tiles(max_pip=MAX_PIP):
     """
     Crop individual domino tiles from Tile_Set.jpg
     Assumes the tile set is arranged in a grid format
@@ -51,18 +53,19 @@ def crop_domino_tiles():
     
     print("Trying different grid configurations...")
     
-    # Let's start with the most common: 7x4 grid
-    cols, rows = 7, 4
+    # Let's start with the most common: one column per suit (7x4 grid for double-six)
+    cols = max_pip + 1
+    rows = (tile_count(max_pip) + cols - 1) // cols
     tile_width = width // cols
     tile_height = height // rows
     
     print(f"Using grid: {cols} columns x {rows} rows")
     print(f"Each tile size: {tile_width} x {tile_height}")
     
-    # Generate all domino combinations (0-0 through 6-6)
+    # Generate all domino combinations (0-0 through 6-6 for double-six)
     domino_tiles = []
-    for i in range(7):
-        for j in range(i, 7):
+    for i in range(max_pip + 1):
+        for j in range(i, max_pip + 1):
             domino_tiles.append((i, j))
     
     print(f"Total domino tiles to extract: {len(domino_tiles)}")
@@ -134,7 +137,7 @@ def get_all_tile_images():
     
     print("Created tile_mappings.py for easy image access")
 
-def preview_extraction():
+def preview_extraction(max_pip=MAX_PIP):
     """Preview what the extraction will look like without actually cropping"""
     try:
         tile_set = Image.open('Tile_Set.jpg')
@@ -143,8 +146,9 @@ def preview_extraction():
         print("=== TILE EXTRACTION PREVIEW ===")
         print(f"Source image: Tile_Set.jpg ({width} x {height})")
         
-        # Try 7x4 grid
-        cols, rows = 7, 4
+        # Try one column per suit (7x4 grid for double-six)
+        cols = max_pip + 1
+        rows = (tile_count(max_pip) + cols - 1) // cols
         tile_width = width // cols
         tile_height = height // rows
         
@@ -153,8 +157,8 @@ def preview_extraction():
         
         # Show what tiles will be extracted
         domino_tiles = []
-        for i in range(7):
-            for j in range(i, 7):
+        for i in range(max_pip + 1):
+            for j in range(i, max_pip + 1):
                 domino_tiles.append((i, j))
         
         print(f"Will extract {len(domino_tiles)} tiles:")
@@ -0,0 +1,231 @@
+"""
+Vectorized reinforcement learning environment
+Runs many domino games side by side on NumPy arrays with a gym style
+reset(n) / step(actions) API. The agent plays seat 1 (index 0), the other
+seats play like DominoGame.play_turn (first valid tile in tile order) and the
+highest double dealt (the 6-6 in a standard game) opens, then its owner moves
+again, so the rules match the console engine. Set size and player count are the same options as
+DominoGame(max_pip, player_count, hand_size), undealt tiles stay hidden.
+
+Actions are tile * 2 + side (0 = left end, 1 = right end). Observations are
+written into the same preallocated arrays every step, copy them if you need to
+keep them. Finished games are reset automatically: step() reports their
+reward and done flag and the returned observation is the new game
+"""
+
+import numpy as np
+import time
+
+from domino_game import default_hand_size
+
+LEFT = 0
+RIGHT = 1
+
+AGENT = 0
+PLAYED = -1
+BONEYARD = -2
+
+
+class DominoVecEnv:
+    def __init__(self, max_pip=6, player_count=4, hand_size=None, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.num_envs = 0
+
+        self.tiles = np.array([(i, k) for i in range(max_pip + 1) for k in range(i, max_pip + 1)], dtype=np.int8)
+        self.tile_count = len(self.tiles)
+        self.suits = max_pip + 1
+        self.players = player_count
+        if hand_size is None:
+            hand_size = default_hand_size(max_pip, player_count)
+        self.hand_size = hand_size
+        self.action_count = self.tile_count * 2
+
+        # suit_tiles[s, t] is True when tile t has a half with s pips
+        self.suit_tiles = np.zeros((self.suits, self.tile_count), dtype=bool)
+        self.suit_tiles[self.tiles[:, 0], np.arange(self.tile_count)] = True
+        self.suit_tiles[self.tiles[:, 1], np.arange(self.tile_count)] = True
+        self.pip_sum = self.tiles.sum(axis=1).astype(np.int8)
+        self.doubles = np.flatnonzero(self.tiles[:, 0] == self.tiles[:, 1])
+
+        # Seat of every position in a shuffled tile order, what's left is the boneyard
+        self.deal_seats = np.full(self.tile_count, BONEYARD, dtype=np.int8)
+        self.deal_seats[:player_count * hand_size] = np.repeat(np.arange(player_count, dtype=np.int8), hand_size)
+
+    def reset(self, n):
+        """Start n new games and return the first observations"""
+        self.num_envs = n
+        self.all_envs = np.arange(n)
+
+        # Game state
+        self.owner = np.full((n, self.tile_count), PLAYED, dtype=np.int8)
+        self.ends = np.zeros((n, 2), dtype=np.int8)
+        self.seat = np.zeros(n, dtype=np.int8)
+        self.passes_in_row = np.zeros(n, dtype=np.int8)
+        self.pass_suits = np.zeros((n, self.players, self.suits), dtype=bool)
+        self.done = np.zeros(n, dtype=bool)
+
+        # Step results and observations, reused every step
+        self.rewards = np.zeros(n, dtype=np.float32)
+        self.dones = np.zeros(n, dtype=bool)
+        self.obs = {
+            "hand": np.zeros((n, self.tile_count), dtype=bool),
+            "ends": np.zeros((n, 2), dtype=np.int8),
+            "played": np.zeros((n, self.tile_count), dtype=bool),
+            "passes": np.zeros((n, self.players, self.suits), dtype=bool),  # suits each seat passed on
+            "hand_counts": np.zeros((n, self.players), dtype=np.int8),
+            "legal_actions": np.zeros((n, self.action_count), dtype=bool),
+        }
+        self.legal_by_side = self.obs["legal_actions"].reshape(n, self.tile_count, 2)
+
+        self.deal(self.all_envs)
+        self.write_obs()
+        return self.obs
+
+    def step(self, actions):
+        """Play one agent move in every game, returns (obs, rewards, dones)"""
+        actions = np.asarray(actions)
+        if not self.obs["legal_actions"][self.all_envs, actions].all():
+            raise ValueError("Illegal action, check obs['legal_actions']")
+
+        self.rewards[:] = 0
+        self.dones[:] = False
+
+        self.place(self.all_envs, actions // 2, actions % 2, self.seat)
+        waiting = self.all_envs[~self.done]
+        self.seat[waiting] = (self.seat[waiting] + 1) % self.players
+        self.advance(waiting)
+
+        finished = np.flatnonzero(self.done)
+        if len(finished):
+            self.dones[finished] = True
+            self.deal(finished)
+
+        self.write_obs()
+        return self.obs, self.rewards, self.dones
+
+    def deal(self, envs):
+        """Shuffle and deal new games, the highest double opens and play runs up to the agent's turn"""
+        # Keep the rewards of the games that just finished in step()
+        dealt = envs
+        rewards = self.rewards[dealt]
+
+        while len(envs):
+            rows = np.arange(len(envs))
+            order = self.rng.permuted(np.tile(np.arange(self.tile_count), (len(envs), 1)), axis=1)
+            owner = np.empty((len(envs), self.tile_count), dtype=np.int8)
+            owner[rows[:, None], order] = self.deal_seats
+            self.start(envs, owner)
+
+            # A game can end before the agent ever has a move, deal those again
+            envs = envs[self.done[envs]]
+
+        self.rewards[dealt] = rewards
+
+    def start(self, envs, owner):
+        """Start games from dealt hands (seat of every tile or BONEYARD) and play up to the agent's turn"""
+        rows = np.arange(len(envs))
+        owner = owner.copy()
+
+        # The highest double that was dealt opens, like DominoGame.find_starting_double
+        dealt_doubles = owner[:, self.doubles] >= 0
+        opening = self.doubles[len(self.doubles) - 1 - dealt_doubles[:, ::-1].argmax(axis=1)]
+        starter = owner[rows, opening]
+        owner[rows, opening] = PLAYED
+
+        self.owner[envs] = owner
+        self.ends[envs] = self.tiles[opening, 0][:, None]
+        # The opener moves again, like DominoGame.start_game
+        self.seat[envs] = starter
+        self.passes_in_row[envs] = 0
+        self.pass_suits[envs] = False
+        self.done[envs] = False
+        # No double dealt at all (small hands from a big set), deal again
+        self.done[envs[~dealt_doubles.any(axis=1)]] = True
+        self.advance(envs)
+
+    def legal_tiles(self, envs, seats):
+        """Get a (len(envs), tile_count) mask of the tiles each seat could play"""
+        ends = self.ends[envs]
+        return (self.owner[envs] == seats[:, None]) & (self.suit_tiles[ends[:, 0]] | self.suit_tiles[ends[:, 1]])
+
+    def place(self, envs, tiles, sides, seats):
+        """Put tiles on the board and finish the games where the hand is now empty"""
+        matched = self.ends[envs, sides]
+        self.ends[envs, sides] = self.pip_sum[tiles] - matched
+        self.owner[envs, tiles] = PLAYED
+        self.passes_in_row[envs] = 0
+
+        empty = ~(self.owner[envs] == seats[:, None]).any(axis=1)
+        if empty.any():
+            winners = envs[empty]
+            self.done[winners] = True
+            self.rewards[winners] = np.where(seats[empty] == AGENT, 1.0, -1.0)
+
+    def record_pass(self, envs, seats):
+        """Remember which numbers a seat passed on, four passes in a row block the game"""
+        self.pass_suits[envs, seats, self.ends[envs, 0]] = True
+        self.pass_suits[envs, seats, self.ends[envs, 1]] = True
+        self.passes_in_row[envs] += 1
+        self.done[envs[self.passes_in_row[envs] >= self.players]] = True
+
+    def advance(self, envs):
+        """Play the other seats (and the agent's forced passes) until the agent has a move"""
+        envs = envs[~self.done[envs]]
+        while len(envs):
+            seats = self.seat[envs]
+            legal = self.legal_tiles(envs, seats)
+            has_move = legal.any(axis=1)
+
+            automatic = ~((seats == AGENT) & has_move)
+            envs, seats, legal, has_move = envs[automatic], seats[automatic], legal[automatic], has_move[automatic]
+            if not len(envs):
+                break
+
+            if has_move.any():
+                # Like play_tile: first valid tile, on the left if it matches the left end
+                movers = envs[has_move]
+                tiles = legal[has_move].argmax(axis=1)
+                sides = np.where(self.suit_tiles[self.ends[movers, 0], tiles], LEFT, RIGHT)
+                self.place(movers, tiles, sides, seats[has_move])
+            if not has_move.all():
+                self.record_pass(envs[~has_move], seats[~has_move])
+
+            envs = envs[~self.done[envs]]
+            self.seat[envs] = (self.seat[envs] + 1) % self.players
+
+    def write_obs(self):
+        """Fill the observation arrays from the game state without allocating new ones"""
+        obs = self.obs
+        np.equal(self.owner, AGENT, out=obs["hand"])
+        np.equal(self.owner, PLAYED, out=obs["played"])
+        obs["ends"][:] = self.ends
+        obs["passes"][:] = self.pass_suits
+        for seat in range(self.players):
+            obs["hand_counts"][:, seat] = np.count_nonzero(self.owner == seat, axis=1)
+        np.logical_and(self.suit_tiles[self.ends[:, 0]], obs["hand"], out=self.legal_by_side[:, :, LEFT])
+        np.logical_and(self.suit_tiles[self.ends[:, 1]], obs["hand"], out=self.legal_by_side[:, :, RIGHT])
+
+
+def benchmark(num_envs=1024, steps=1000, seed=0, max_pip=6):
+    """Time random legal play and report environment steps per second"""
+    env = DominoVecEnv(max_pip, seed=seed)
+    obs = env.reset(num_envs)
+    rng = np.random.default_rng(seed)
+    scores = np.empty((num_envs, env.action_count))
+    games = 0
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        rng.random(out=scores)
+        scores *= obs["legal_actions"]
+        obs, rewards, dones = env.step(scores.argmax(axis=1))
+        games += int(dones.sum())
+    seconds = time.perf_counter() - start
+
+    print("=== VECTOR ENVIRONMENT BENCHMARK ===")
+    print(f"{num_envs} games x {steps} steps in {seconds:.2f} s")
+    print(f"{num_envs * steps / seconds:,.0f} steps/s, {games / seconds:,.0f} games/s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,469 @@
+"""
+Domino game engine
+Importing this module only defines the classes, nothing is played until
+main() runs. Start a console game with: python -m domino_game
+Anything not needed to define the engine (random, time, the board layout,
+the Kivy GUI) is imported where it is used so the import stays cheap
+"""
+
+# Highest pip count in the set: 6 for double-six (28 tiles), 9 for double-nine (55), 12 for double-twelve (91)
+MAX_PIP = 6
+
+# Tiles dealt to each player for the standard sets, smaller if there are
+# too many players to go round
+HAND_SIZES = {6: 7, 9: 9, 12: 12}
+
+def tile_count(max_pip):
+    """Number of tiles in a double-max_pip set"""
+    return (max_pip + 1) * (max_pip + 2) // 2
+
+def default_hand_size(max_pip, player_count):
+    """Tiles each player gets when no hand size is given"""
+    return min(HAND_SIZES.get(max_pip, 7), tile_count(max_pip) // player_count)
+
+PLAYER_NAMES = ["Kalm", "Claire", "Akasha", "Shiva"]
+
+# Shared tile sets by max_pip, see tile_catalog()
+TILE_CATALOGS = {}
+
+def tile_catalog(max_pip):
+    """Get the tiles of a set (0-0 through max_pip-max_pip), every game shares the same tuple"""
+    tiles = TILE_CATALOGS.get(max_pip)
+    if tiles is None:
+        tiles = TILE_CATALOGS[max_pip] = tuple(Tile(i, k) for i in range(max_pip + 1) for k in range(i, max_pip + 1))
+    return tiles
+
+class DominoGame:
+    def __init__(self, max_pip=MAX_PIP, player_count=4, hand_size=None):
+        self.max_pip = max_pip            # 6, 9 or 12 for a double-six, -nine or -twelve set
+        self.player_count = player_count
+        if player_count < 2:
+            raise ValueError(f"A game needs at least 2 players, not {player_count}")
+        if hand_size is None:
+            hand_size = default_hand_size(max_pip, player_count)
+        if hand_size < 1:
+            raise ValueError(f"Not enough tiles in a double-{max_pip} set for {player_count} players")
+        if hand_size * player_count > tile_count(max_pip):
+            raise ValueError(f"Not enough tiles for {player_count} hands of {hand_size}")
+        self.hand_size = hand_size
+        self.tiles = ()           # Shared Tile catalog, see tile_catalog()
+        self.owners = bytearray() # Player number (1-n) holding each tile, 0 when unassigned or played
+        self.players = []
+        self.board = []
+        self.move_history = []  # (player_index, left, right, side) in play order
+        self.layout = None        # board_layout console layout, created once the board no longer fits a line
+        self.board_left = 0
+        self.board_right = 0
+        self.current_player = 0
+        self.passes_in_row = 0
+        self.game_over = False
+        self.verbose = True       # Print the game to the console
+        self.turn_delay = 0.5     # Seconds between turns, 0 when a UI does the pacing
+        self.event_listeners = [] # Called as listener(event_type, data) for every game event
+        self.profiler = NULL_PROFILER  # A profiler.Profiler to time the game loop
+
+    def generate_tiles(self):
+        """Generate every domino tile in the set (0-0 through 6-6 for double-six)"""
+        self.tiles = tile_catalog(self.max_pip)
+        self.owners = bytearray(len(self.tiles))  # 0 means unassigned
+    
+    def create_players(self):
+        """Create the players, past the four named ones they are numbered"""
+        self.players = []
+        for player_index in range(self.player_count):
+            if player_index < len(PLAYER_NAMES):
+                name = PLAYER_NAMES[player_index]
+            else:
+                name = f"Player {player_index + 1}"
+            self.players.append(Player(name, 0))
+    
+    def assign_tiles(self):
+        """Randomly deal hand_size tiles to each player, the rest stay unassigned"""
+        import random
+        # Draw every hand in one go instead of retrying random tiles until a free one comes up
+        dealt = random.sample(range(len(self.tiles)), self.hand_size * self.player_count)
+        for player_index in range(self.player_count):
+            for tile_index in dealt[player_index * self.hand_size:(player_index + 1) * self.hand_size]:
+                self.owners[tile_index] = player_index + 1  # Assign to player (1-n)
+            self.players[player_index].tiles_assigned = self.hand_size
+    
+    def setup_game(self):
+        """Initialize the complete game setup"""
+        with self.profiler.span("deal"):
+            self.generate_tiles()
+            self.create_players()
+            self.assign_tiles()
+
+    def play_round(self):
+        """Main game loop"""
+        while not self.game_over:
+            self.play_turn()
+    
+    def find_starting_double(self):
+        """Find the highest double that was dealt, returns (player_num, tile_index)"""
+        for i in range(len(self.tiles) - 1, -1, -1):
+            tile = self.tiles[i]
+            if tile.left == tile.right and self.owners[i]:
+                return self.owners[i], i
+        return None, None
+    
+    def find_double_six(self):
+        """Find who has the double-six tile to start the game (the highest double in bigger sets)"""
+        return self.find_starting_double()[0]
+    
+    def display_player_tiles(self, player_num):
+        """Display all tiles for a specific player"""
+        player = self.players[player_num - 1]
+        self.log(f"\nTiles for {player.name}:")
+        player_tiles = []
+        for i, tile in enumerate(self.tiles):
+            if self.owners[i] == player_num:
+                player_tiles.append((i, tile))
+                self.log(f"  {i}: {tile}")
+        return player_tiles
+    
+    def log(self, *args):
+        """Print to the console unless the game is running quietly"""
+        if self.verbose:
+            print(*args)
+    
+    def emit(self, event_type, **data):
+        """Send a game event ("tile_played", "pass", "game_over") to every listener"""
+        for listener in self.event_listeners:
+            listener(event_type, data)
+    
+    def record_move(self, player_index, left, right, side):
+        """Remember a placed tile (left/right as it reads on the board) and lay it out"""
+        self.move_history.append((player_index, left, right, side))
+        if self.layout is not None:
+            self.layout.add_tile(left, right, side)
+        self.emit("tile_played", player=player_index, left=left, right=right, side=side)
+    
+    def display_board(self):
+        """Display the current game board"""
+        if not self.verbose:
+            return
+        self.log("\n" + "="*100)
+        if self.board:
+            board_str = ' '.join(self.board)
+            if len(board_str) <= 100:
+                self.log(board_str.center(100))
+            else:
+                # Too long for one line, wrap it as a snake
+                from board_layout import console_layout, render_text
+                if self.layout is None:
+                    self.layout = console_layout(100, self.max_pip)
+                    for _, left, right, side in self.move_history:
+                        self.layout.add_tile(left, right, side)
+                self.log('\n'.join(render_text(self.layout, 100)))
+        else:
+            self.log("Board is empty".center(100))
+        self.log("="*100)
+    
+    def start_game(self):
+        """Start the game with the player who has the highest double (double-six in a standard set)"""
+        starter, tile_index = self.find_starting_double()
+        if not starter:
+            self.log("No double found! Cannot start game.")
+            return
+        
+        # Set the starting player
+        self.current_player = starter - 1  # Convert to 0-based index
+        
+        # Place the double on the board
+        tile = self.tiles[tile_index]
+        self.board.append(str(tile))
+        self.board_left = tile.left
+        self.board_right = tile.right
+        self.record_move(starter - 1, tile.left, tile.right, "start")
+        self.owners[tile_index] = 0  # Mark as played
+        self.players[starter-1].tiles_assigned -= 1
+        
+        self.log(f"\n{self.players[starter-1].name} starts with the double-{tile.left}!")
+        self.display_board()
+        
+        # Start the main game loop
+        self.play_game()
+    
+    def can_play_tile(self, tile_index):
+        """Check if a tile can be played on the current board"""
+        if tile_index < 0 or tile_index >= len(self.tiles):
+            return False
+        
+        if self.owners[tile_index] != self.current_player + 1:  # Player doesn't own this tile
+            return False
+        
+        if not self.board:  # Empty board
+            return True
+        
+        return self.tiles[tile_index].can_connect_to(self.board_left, self.board_right)
+    
+    def play_tile(self, tile_index):
+        """Play a tile on the board"""
+        if not self.can_play_tile(tile_index):
+            self.log("Cannot play that tile!")
+            return False
+        
+        tile = self.tiles[tile_index]
+        
+        # Determine where and how to place the tile
+        if tile.left == self.board_left:
+            # Place on left side, flipped
+            self.board.insert(0, f"| {tile.right} | {tile.left} |")
+            self.record_move(self.current_player, tile.right, tile.left, "left")
+            self.board_left = tile.right
+        elif tile.right == self.board_left:
+            # Place on left side, as is
+            self.board.insert(0, str(tile))
+            self.record_move(self.current_player, tile.left, tile.right, "left")
+            self.board_left = tile.left
+        elif tile.left == self.board_right:
+            # Place on right side, as is
+            self.board.append(str(tile))
+            self.record_move(self.current_player, tile.left, tile.right, "right")
+            self.board_right = tile.right
+        elif tile.right == self.board_right:
+            # Place on right side, flipped
+            self.board.append(f"| {tile.right} | {tile.left} |")
+            self.record_move(self.current_player, tile.right, tile.left, "right")
+            self.board_right = tile.left
+        
+        # Mark tile as played
+        self.owners[tile_index] = 0
+        self.players[self.current_player].tiles_assigned -= 1
+        self.passes_in_row = 0
+        
+        self.log(f"\n{self.players[self.current_player].name} played tile {tile_index}: {tile}")
+        return True
+    
+    def next_turn(self):
+        """Move to the next player's turn"""
+        self.current_player = (self.current_player + 1) % self.player_count
+    
+    def check_win_condition(self):
+        """Check if any player has won (no tiles left)"""
+        for player in self.players:
+            if player.tiles_assigned == 0:
+                self.game_over = True
+                self.log(f"\n*** {player.name} WINS! ***")
+                self.emit("game_over", winner=self.players.index(player), reason="domino")
+                return True
+        return False
+    
+    def player_has_valid_moves(self, player_num):
+        """Check if a player has any valid moves"""
+        for i, owner in enumerate(self.owners):
+            if owner == player_num and self.can_play_tile(i):
+                return True
+        return False
+    
+    def play_turn(self):
+        """Handle a single player's turn"""
+        profiler = self.profiler
+        with profiler.span("turn"):
+            profiler.count("turns")
+            current_player_num = self.current_player + 1
+            player = self.players[self.current_player]
+            
+            self.log(f"\n--- {player.name}'s Turn ---")
+            
+            # Check if player has valid moves
+            with profiler.span("move_generation"):
+                has_valid_moves = self.player_has_valid_moves(current_player_num)
+            if not has_valid_moves:
+                profiler.count("passes")
+                self.log(f"{player.name} has no valid moves and must pass.")
+                self.emit("pass", player=self.current_player)
+                self.passes_in_row += 1
+                if self.passes_in_row >= self.player_count:
+                    # Nobody can play, the game is blocked
+                    self.game_over = True
+                    self.log("\nNobody can play, the game is blocked.")
+                    self.emit("game_over", winner=None, reason="blocked")
+                    return
+                self.next_turn()
+                return
+            
+            # Display current board and player's tiles
+            with profiler.span("rendering"):
+                self.display_board()
+                self.display_player_tiles(current_player_num)
+            
+            # For now, we'll simulate a move (you can add input later)
+            # Find first valid tile and play it
+            with profiler.span("strategy"):
+                chosen = None
+                for i, owner in enumerate(self.owners):
+                    if owner == current_player_num and self.can_play_tile(i):
+                        chosen = i
+                        break
+            
+            with profiler.span("placement"):
+                self.play_tile(chosen)
+            
+            with profiler.span("rendering"):
+                self.display_board()
+            
+            # Check win condition
+            with profiler.span("win_check"):
+                won = self.check_win_condition()
+            if not won:
+                self.next_turn()
+    
+    def turn_limit(self):
+        """Most turns play_game() runs before calling the game off (prevents infinite loops)"""
+        return max(50, len(self.tiles) * self.player_count)
+    
+    def play_game(self):
+        """Main game loop"""
+        turn_count = 0
+        max_turns = self.turn_limit()
+        
+        while not self.game_over and turn_count < max_turns:
+            self.play_turn()
+            turn_count += 1
+            
+            # Add a small pause for readability
+            if self.turn_delay:
+                import time
+                time.sleep(self.turn_delay)
+        
+        if turn_count >= max_turns:
+            self.log("\nGame ended due to turn limit.")
+            if not self.game_over:
+                self.emit("game_over", winner=None, reason="turn_limit")
+        
+        self.log("\n*** GAME OVER ***")
+
+class Tile:
+    """A tile of the set, immutable and shared by every game (who holds it is in DominoGame.owners)"""
+    __slots__ = ('left', 'right')
+
+    def __init__(self, left, right):
+        object.__setattr__(self, 'left', left)
+        object.__setattr__(self, 'right', right)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Tiles are shared between games and can't be changed")
+    
+    def __reduce__(self):
+        return (Tile, (self.left, self.right))
+
+    def display(self):
+        """Display this tile in a nice format"""
+        print(f' | {self.left} | {self.right} | ')
+    
+    def __str__(self):
+        """String representation of the tile"""
+        return f'| {self.left} | {self.right} |'
+    
+    def can_connect_to(self, board_left, board_right):
+        """Check if this tile can connect to either end of the board"""
+        return (self.left == board_left or self.left == board_right or 
+                self.right == board_left or self.right == board_right)
+
+class NullProfiler:
+    """Stands in for profiler.Profiler while profiling is off, spans and counters do nothing"""
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def span(self, name):
+        return self
+    
+    def count(self, name, amount=1):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+class Player:
+    __slots__ = ('name', 'tiles_assigned')
+
+    def __init__(self, name, tiles_assigned):
+        self.name = name
+        self.tiles_assigned = tiles_assigned
+    
+    def __str__(self):
+        return f"Player: {self.name} (Tiles: {self.tiles_assigned})"
+
+
+def player_count_arg(text):
+    """argparse type for --players"""
+    import argparse
+    try:
+        count = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a whole number: {text!r}")
+    if count < 2:
+        raise argparse.ArgumentTypeError(f"a game needs at least 2 players, not {count}")
+    return count
+
+
+def main(argv=None):
+    """Set up a game and play it in the console (or in the Kivy GUI with --gui)"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="domino_game", description="Simple Domino Game")
+    parser.add_argument("--gui", action="store_true", help="play in the Kivy board window")
+    parser.add_argument("--delay", type=float, default=0.5, help="seconds between turns")
+    parser.add_argument("--max-pip", type=int, default=6, choices=(6, 9, 12), help="double-six, -nine or -twelve set")
+    parser.add_argument("--players", type=player_count_arg, default=4, help="number of players (at least 2)")
+    parser.add_argument("--profile", metavar="PATH", help="time the game loop, write PATH.json and PATH.folded")
+    parser.add_argument("--results", metavar="DB", help="save the result and update the ratings in a results_store database")
+    args = parser.parse_args(argv)
+    
+    # Create a new game instance
+    try:
+        game = DominoGame(args.max_pip, args.players)
+    except ValueError as e:
+        parser.error(str(e))
+    game.turn_delay = args.delay
+    if args.profile:
+        from profiler import Profiler
+        game.profiler = Profiler()
+    if args.results:
+        from results_store import ResultsStore
+        store = ResultsStore(args.results)
+        store.listen(game)
+    
+    try:
+        # Set up the game (generate tiles, create players, assign tiles)
+        game.setup_game()
+        
+        if args.gui:
+            from kivy_board import run_board_app
+            run_board_app(game, args.delay)
+        else:
+            # Display the initial setup
+            print("DOMINO GAME SETUP COMPLETE!")
+            print(f"Generated {len(game.tiles)} tiles")
+            print("Players:")
+            for i, player in enumerate(game.players):
+                print(f"  {i+1}. {player}")
+            
+            # Start and play the game!
+            print("\n" + "="*50)
+            print("STARTING DOMINO GAME!")
+            print("="*50)
+            
+            game.start_game()
+        
+        if args.profile:
+            game.profiler.report()
+            game.profiler.dump_json(args.profile + ".json")
+            game.profiler.dump_folded(args.profile + ".folded")
+            print(f"Profile written to {args.profile}.json and {args.profile}.folded")
+        
+        if args.results:
+            store.update_ratings()
+            for rank, name, elo, games, wins in store.leaderboard():
+                print(f"{rank:>3}. {name:<12} {elo:7.1f}  ({wins}/{games} wins)")
+    finally:
+        # Write the buffered result even if the game or the window failed
+        if args.results:
+            store.close()
+
+if __name__ == "__main__":
+    main()
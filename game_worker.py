@@ -0,0 +1,115 @@
+"""
+Background game worker
+Plays a DominoGame on a worker thread (or process) at full speed and streams
+what happens to the UI as events through a queue. The UI decides how fast to
+show them with an EventPacer instead of the engine sleeping between turns
+"""
+
+from collections import namedtuple
+import queue
+import threading
+
+# type is "tile_played", "pass", "game_over", "error" (the engine raised, data["message"] says what)
+# or "finished" (the worker is done)
+GameEvent = namedtuple('GameEvent', ['type', 'data'])
+
+
+def run_game(game, events):
+    """Worker entry point: play a set up game quietly, posting every event to events"""
+    game.verbose = False
+    game.turn_delay = 0
+    game.event_listeners.append(lambda event_type, data: events.put(GameEvent(event_type, data)))
+    try:
+        game.start_game()
+    except Exception as e:
+        events.put(GameEvent("error", {"message": str(e)}))
+    events.put(GameEvent("finished", {}))
+
+
+class GameWorker:
+    def __init__(self, game, use_process=False):
+        # game must already be set up (setup_game) and not started yet
+        self.game = game
+        self.use_process = use_process
+        self.worker = None
+        self.finished = False
+
+        if use_process:
+            import multiprocessing
+            self.events = multiprocessing.Queue()
+        else:
+            self.events = queue.SimpleQueue()
+
+    def start(self):
+        """Start playing the game in the background"""
+        if self.use_process:
+            import multiprocessing
+            # The process gets a copy of the game, the UI only sees it through events
+            self.worker = multiprocessing.Process(target=run_game, args=(self.game, self.events), daemon=True)
+        else:
+            self.worker = threading.Thread(target=run_game, args=(self.game, self.events),
+                                           name="domino-engine", daemon=True)
+        self.worker.start()
+
+    def poll(self, max_events=None):
+        """Get the events posted since the last poll without blocking"""
+        events = []
+        while max_events is None or len(events) < max_events:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event.type == "finished":
+                self.finished = True
+            events.append(event)
+        return events
+
+    def stop(self):
+        """Ask the engine to end the game after the current turn"""
+        if self.use_process:
+            if self.worker is not None:
+                self.worker.terminate()
+        else:
+            self.game.game_over = True
+
+    def join(self, timeout=None):
+        if self.worker is not None:
+            self.worker.join(timeout)
+
+
+class EventPacer:
+    """
+    Releases worker events to the UI at a steady pace. move_history mirrors
+    DominoGame.move_history for the moves released so far, so a board view
+    can follow the pacer exactly like it follows a game
+    """
+
+    def __init__(self, worker, turn_delay=0.5):
+        self.worker = worker
+        self.turn_delay = turn_delay
+        self.pending = []
+        self.move_history = []
+        self.game_over = None
+        self.wait = 0
+
+    def update(self, dt):
+        """Call once per frame, returns the events released this frame"""
+        self.pending.extend(self.worker.poll())
+        self.wait -= dt
+
+        released = []
+        while self.pending and self.wait <= 0:
+            event = self.pending.pop(0)
+            released.append(event)
+            if event.type == "tile_played":
+                data = event.data
+                self.move_history.append((data["player"], data["left"], data["right"], data["side"]))
+            elif event.type == "game_over":
+                self.game_over = event.data
+
+            # Turns take turn_delay each, other events go straight through
+            if event.type in ("tile_played", "pass"):
+                self.wait += self.turn_delay
+        if not self.pending:
+            self.wait = max(self.wait, 0)
+        return released
@@ -0,0 +1,232 @@
+"""
+Hand strength lookup table
+Every possible 7 tile opening hand (C(28, 7) = 1,184,040 of them) gets a
+fixed size record with its static features and, optionally, a simulated win
+rate. Records are stored in hand rank order in one file that is memory mapped
+by every reader, so worker processes share the same pages instead of each
+building their own copy.
+
+A hand is a bit mask over the tiles in DominoGame.generate_tiles() order
+(0-0, 0-1, ... 6-6). hand_index(mask) turns it into its rank with the
+combinatorial number system using a few table lookups
+"""
+
+from collections import namedtuple
+from itertools import combinations
+from math import comb
+import mmap
+import os
+import struct
+
+TILES = [(i, k) for i in range(7) for k in range(i, 7)]
+TILE_COUNT = len(TILES)
+HAND_SIZE = 7
+HAND_COUNT = comb(TILE_COUNT, HAND_SIZE)
+DOUBLE_SIX = TILES.index((6, 6))
+
+DEFAULT_TABLE = 'hand_table.bin'
+
+# File header: magic, record count, record size
+HEADER = struct.Struct('<4sII4x')
+MAGIC = b'DHT1'
+
+# Record: pip total, 7 suit lengths, doubles, flags, 2 pad bytes, win rate
+RECORD = struct.Struct('<B7BBB2xf')
+FLAG_DOUBLE_SIX = 1  # The hand holds the 6-6, so it starts the game
+
+HandFeatures = namedtuple('HandFeatures', ['pip_total', 'suit_lengths', 'doubles', 'has_double_six', 'win_rate'])
+
+# hand_index() works on the mask in 7 bit chunks. RANK_CHUNKS[chunk][k][bits]
+# is what the chunk adds to the rank when k tiles were already set below it
+CHUNK_BITS = 7
+CHUNKS = TILE_COUNT // CHUNK_BITS
+POPCOUNT = [bin(bits).count('1') for bits in range(1 << CHUNK_BITS)]
+
+
+def build_rank_chunks():
+    table = []
+    for chunk in range(CHUNKS):
+        by_count = []
+        for before in range(HAND_SIZE + 1):
+            values = []
+            for bits in range(1 << CHUNK_BITS):
+                rank = 0
+                seen = before
+                for bit in range(CHUNK_BITS):
+                    if bits >> bit & 1:
+                        seen += 1
+                        rank += comb(chunk * CHUNK_BITS + bit, seen)
+                values.append(rank)
+            by_count.append(values)
+        table.append(by_count)
+    return table
+
+RANK_CHUNKS = build_rank_chunks()
+
+
+def tile_index(left, right):
+    """Get a tile's position in generate_tiles() order"""
+    return TILES.index((min(left, right), max(left, right)))
+
+def hand_mask(tiles):
+    """Get the bit mask for a list of (left, right) tiles"""
+    mask = 0
+    for left, right in tiles:
+        mask |= 1 << tile_index(left, right)
+    return mask
+
+def game_hand_mask(game, player_num):
+    """Get the bit mask of the tiles a DominoGame player (1-4) holds"""
+    mask = 0
+    for i, owner in enumerate(game.owners):
+        if owner == player_num:
+            mask |= 1 << i
+    return mask
+
+def hand_index(mask):
+    """Get the rank (0 to HAND_COUNT - 1) of a 7 tile hand mask"""
+    rank = 0
+    before = 0
+    for chunk in range(CHUNKS):
+        bits = mask >> (chunk * CHUNK_BITS) & 0x7F
+        rank += RANK_CHUNKS[chunk][before][bits]
+        before += POPCOUNT[bits]
+    return rank
+
+def hand_features(mask):
+    """Work out the static features of a hand straight from its mask"""
+    pip_total = 0
+    suits = [0] * 7
+    doubles = 0
+    for i, (left, right) in enumerate(TILES):
+        if mask >> i & 1:
+            pip_total += left + right
+            suits[left] += 1
+            if left == right:
+                doubles += 1
+            else:
+                suits[right] += 1
+    return pip_total, suits, doubles, bool(mask >> DOUBLE_SIX & 1)
+
+
+def simulate_win_rate(mask, games):
+    """Deal the rest of the set at random and see how often seat 1 wins with this hand"""
+    import random
+    from domino_game import DominoGame
+
+    rest = [i for i in range(TILE_COUNT) if not mask >> i & 1]
+    wins = 0
+    for _ in range(games):
+        game = DominoGame()
+        game.verbose = False
+        game.turn_delay = 0
+        game.generate_tiles()
+        game.create_players()
+
+        random.shuffle(rest)
+        deal = [i for i in range(TILE_COUNT) if mask >> i & 1] + rest
+        for seat in range(4):
+            for i in deal[seat * HAND_SIZE:(seat + 1) * HAND_SIZE]:
+                game.owners[i] = seat + 1
+            game.players[seat].tiles_assigned = HAND_SIZE
+
+        game.start_game()
+        if game.players[0].tiles_assigned == 0:
+            wins += 1
+    return wins / games
+
+
+def fill_records(path, first_tiles, simulations):
+    """Write the records of every hand whose lowest tile is in first_tiles"""
+    with open(path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as table:
+        for first in first_tiles:
+            for rest in combinations(range(first + 1, TILE_COUNT), HAND_SIZE - 1):
+                mask = 1 << first
+                for i in rest:
+                    mask |= 1 << i
+                pip_total, suits, doubles, has_double_six = hand_features(mask)
+                win_rate = simulate_win_rate(mask, simulations) if simulations else float('nan')
+                RECORD.pack_into(table, HEADER.size + hand_index(mask) * RECORD.size,
+                                 pip_total, *suits, doubles,
+                                 FLAG_DOUBLE_SIX if has_double_six else 0, win_rate)
+
+
+def build_table(path=DEFAULT_TABLE, simulations=0, processes=None):
+    """
+    Build the table file. simulations is the number of games played per hand
+    for the win rate (0 leaves it NaN). processes > 1 splits the hands by their
+    lowest tile over a process pool, each worker writes its records straight
+    into the shared file
+    """
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, HAND_COUNT, RECORD.size))
+        f.truncate(HEADER.size + HAND_COUNT * RECORD.size)
+
+    first_tiles = list(range(TILE_COUNT - HAND_SIZE + 1))
+    if processes and processes > 1:
+        from multiprocessing import Pool
+        # Deal the lowest tiles out round robin, they have by far the most hands
+        jobs = [(path, first_tiles[n::processes], simulations) for n in range(processes)]
+        with Pool(processes) as pool:
+            pool.starmap(fill_records, jobs)
+    else:
+        fill_records(path, first_tiles, simulations)
+
+    print(f"Built {path}: {HAND_COUNT} hands, {os.path.getsize(path)} bytes")
+
+
+class HandTable:
+    def __init__(self, path=DEFAULT_TABLE):
+        self.file = open(path, 'rb')
+        self.table = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, record_size = HEADER.unpack_from(self.table, 0)
+        if magic != MAGIC or count != HAND_COUNT or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a hand table for this version")
+
+    def lookup(self, mask):
+        """Get the HandFeatures record for a hand mask"""
+        values = RECORD.unpack_from(self.table, HEADER.size + hand_index(mask) * RECORD.size)
+        return HandFeatures(values[0], values[1:8], values[8], bool(values[9] & FLAG_DOUBLE_SIX), values[10])
+
+    def win_rate(self, mask):
+        """Get just the simulated win rate of a hand"""
+        offset = HEADER.size + hand_index(mask) * RECORD.size + RECORD.size - 4
+        return struct.unpack_from('<f', self.table, offset)[0]
+
+    def close(self):
+        self.table.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_shared_table = None
+
+def get_table(path=DEFAULT_TABLE):
+    """Get this process's HandTable, opened on first use"""
+    global _shared_table
+    if _shared_table is None:
+        _shared_table = HandTable(path)
+    return _shared_table
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    print("Hand Strength Table Builder")
+    print("=" * 40)
+
+    simulations = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    start = time.perf_counter()
+    build_table(simulations=simulations, processes=os.cpu_count())
+    print(f"Build time: {time.perf_counter() - start:.1f} s")
+
+    with HandTable() as table:
+        mask = hand_mask([(6, 6), (5, 6), (4, 6), (3, 6), (2, 6), (1, 6), (0, 6)])
+        print(f"All the sixes: {table.lookup(mask)}")
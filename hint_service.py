@@ -0,0 +1,375 @@
+"""
+Move hints for human players
+Lists the legal moves of the player to move and ranks them by how often the
+player wins random playouts after making them. Analysis runs in small rounds
+under a time budget and its results are kept in a cache keyed on the
+position, so asking again (or reaching the same position by another move
+order) carries on from what was already worked out. start_thinking() keeps
+analysing on a thread while the player makes up their mind.
+
+A position is what the player can see: their hand, the tiles on the board,
+the two open ends and everybody's tile count counted from the player's seat.
+Playouts deal the unseen tiles at random and then every seat plays like
+DominoGame.play_turn (first valid tile, no drawing). That rule tries the left
+end first, so mirrored boards play out differently and are kept apart.
+
+HintService(rule="v0.05") follows the older TileProjectile_v0.05 game
+instead, where the player only picks a tile and Game.SetTile picks the side:
+there is one move per playable tile, on that side, playouts place tiles the
+same way
+"""
+
+from collections import namedtuple, OrderedDict
+import random
+import threading
+import time
+
+from domino_game import tile_catalog
+
+# hand and played are tile bit masks in tile_catalog order, hand_counts starts with the player to move.
+# left and right are None before the first tile
+Position = namedtuple('Position', ['max_pip', 'hand', 'played', 'left', 'right', 'hand_counts'])
+
+# side is "left", "right" or "start", score is the win rate or the quick estimate before any playouts
+Hint = namedtuple('Hint', ['tile', 'left', 'right', 'side', 'win_rate', 'playouts', 'score'])
+
+ROUND_PLAYOUTS = 8   # Playouts per move in one round of analysis
+BOOK_WEIGHT = 64     # Most playouts an opening book result counts as
+
+# (left, right) pairs of each set by max_pip, plain tuples unpack faster than Tiles in playouts
+TILE_PIPS = {}
+
+def tile_pips(max_pip):
+    pips = TILE_PIPS.get(max_pip)
+    if pips is None:
+        pips = TILE_PIPS[max_pip] = [(tile.left, tile.right) for tile in tile_catalog(max_pip)]
+    return pips
+
+
+def game_position(game):
+    """Get the Position of the player to move in a DominoGame"""
+    seat = game.current_player
+    hand = 0
+    for i, owner in enumerate(game.owners):
+        if owner == seat + 1:
+            hand |= 1 << i
+    index = {(tile.left, tile.right): i for i, tile in enumerate(game.tiles)}
+    played = 0
+    for _, left, right, _ in game.move_history:
+        played |= 1 << index[min(left, right), max(left, right)]
+    counts = [player.tiles_assigned for player in game.players]
+    counts = tuple(counts[seat:] + counts[:seat])
+    if not game.move_history:
+        return Position(game.max_pip, hand, played, None, None, counts)
+    return Position(game.max_pip, hand, played, game.board_left, game.board_right, counts)
+
+
+def legal_moves(tiles, hand, left, right):
+    """Get the (tile index, side) moves, a tile that fits both ends the same way is listed once"""
+    moves = []
+    for i, (a, b) in enumerate(tiles):
+        if not hand >> i & 1:
+            continue
+        if left is None:
+            moves.append((i, "start"))
+            continue
+        if a == left or b == left:
+            moves.append((i, "left"))
+        if (a == right or b == right) and not (left == right and moves and moves[-1][0] == i):
+            moves.append((i, "right"))
+    return moves
+
+
+def set_tile_moves(tiles, hand, left, right):
+    """Get one (tile index, side) move per playable tile, on the side v0.05's Game.SetTile puts it"""
+    moves = []
+    for i, (a, b) in enumerate(tiles):
+        if not hand >> i & 1:
+            continue
+        # SetTile tries the tile's left half on both ends before its right half
+        if a == left:
+            moves.append((i, "left"))
+        elif a == right:
+            moves.append((i, "right"))
+        elif b == left:
+            moves.append((i, "left"))
+        elif b == right:
+            moves.append((i, "right"))
+    return moves
+
+
+def place(tile, side, left, right):
+    """Get the board ends after laying tile on side"""
+    a, b = tile
+    if side == "start":
+        return a, b
+    if side == "left":
+        return (b if a == left else a), right
+    return left, (b if a == right else a)
+
+
+def quick_score(tiles, hand, move, left, right):
+    """A rough value before any playouts: shed heavy tiles and doubles, keep a follow-up move"""
+    i, side = move
+    a, b = tiles[i]
+    left, right = place(tiles[i], side, left, right)
+    rest = hand & ~(1 << i)
+    follow = sum(1 for n, (c, d) in enumerate(tiles) if rest >> n & 1 and (c in (left, right) or d in (left, right)))
+    return (a + b) / 24 + (0.1 if a == b else 0) + 0.05 * follow
+
+
+def playout(tiles, hands, left, right, seat):
+    """Play a dealt position out with the engine's first-valid-tile rule, returns the winning seat or None"""
+    players = len(hands)
+    passes = 0
+    while True:
+        hand = hands[seat]
+        for n, i in enumerate(hand):
+            a, b = tiles[i]
+            if a == left:
+                left = b
+            elif b == left:
+                left = a
+            elif a == right:
+                right = b
+            elif b == right:
+                right = a
+            else:
+                continue
+            del hand[n]
+            if not hand:
+                return seat
+            passes = 0
+            break
+        else:
+            passes += 1
+            if passes >= players:
+                return None
+        seat = (seat + 1) % players
+
+
+def playout_v005(tiles, hands, left, right, seat):
+    """Like playout(), but tiles are laid on the side v0.05's Game.SetTile picks"""
+    players = len(hands)
+    passes = 0
+    while True:
+        hand = hands[seat]
+        for n, i in enumerate(hand):
+            a, b = tiles[i]
+            if a == left:
+                left = b
+            elif a == right:
+                right = b
+            elif b == left:
+                left = a
+            elif b == right:
+                right = a
+            else:
+                continue
+            del hand[n]
+            if not hand:
+                return seat
+            passes = 0
+            break
+        else:
+            passes += 1
+            if passes >= players:
+                return None
+        seat = (seat + 1) % players
+
+
+# How moves are listed and games played out for each rule
+RULES = {
+    "domino_game": (legal_moves, playout),
+    "v0.05": (set_tile_moves, playout_v005),
+}
+
+
+class Analysis:
+    """Playout totals for the moves of one position"""
+
+    def __init__(self, position, book=None, rule="domino_game"):
+        tiles = tile_pips(position.max_pip)
+        moves, self.playout = RULES[rule]
+        self.moves = moves(tiles, position.hand, position.left, position.right)
+        self.estimates = [quick_score(tiles, position.hand, move, position.left, position.right) for move in self.moves]
+        self.wins = [0] * len(self.moves)
+        self.playouts = [0] * len(self.moves)
+        # Tiles nobody has shown yet, dealt at random to the other seats for each playout
+        self.unseen = [i for i in range(len(tiles)) if not (position.hand | position.played) >> i & 1]
+
+        # Start from the opening book's results where it has them
+        if book is not None:
+            for move in book.lookup(position):
+                if (move.tile, move.side) in self.moves:
+                    n = self.moves.index((move.tile, move.side))
+                    weight = min(move.games, BOOK_WEIGHT)
+                    self.wins[n] += move.win_rate * weight
+                    self.playouts[n] += weight
+
+    def run_round(self, position, rng):
+        """Add ROUND_PLAYOUTS playouts to every move"""
+        tiles = tile_pips(position.max_pip)
+        hand = [i for i in range(len(tiles)) if position.hand >> i & 1]
+        unseen = self.unseen
+        for n, (i, side) in enumerate(self.moves):
+            if len(hand) == 1:
+                # Playing the last tile wins outright
+                self.wins[n] += ROUND_PLAYOUTS
+                self.playouts[n] += ROUND_PLAYOUTS
+                continue
+            left, right = place(tiles[i], side, position.left, position.right)
+            mine = [t for t in hand if t != i]
+            for _ in range(ROUND_PLAYOUTS):
+                deal = rng.sample(unseen, len(unseen))
+                hands = [list(mine)]
+                start = 0
+                for count in position.hand_counts[1:]:
+                    hands.append(sorted(deal[start:start + count]))
+                    start += count
+                if self.playout(tiles, hands, left, right, 1 % len(hands)) == 0:
+                    self.wins[n] += 1
+                self.playouts[n] += 1
+
+    def ranked(self, tiles):
+        """Get the Hints best first"""
+        hints = []
+        for n, (i, side) in enumerate(self.moves):
+            win_rate = self.wins[n] / self.playouts[n] if self.playouts[n] else None
+            score = self.estimates[n] if win_rate is None else win_rate
+            hints.append(Hint(i, *tiles[i], side, win_rate, self.playouts[n], score))
+        hints.sort(key=lambda hint: -hint.score)
+        return hints
+
+
+class HintService:
+    def __init__(self, max_entries=10_000, seed=None, book=None, rule="domino_game"):
+        if rule not in RULES:
+            raise ValueError(f"Unknown rule {rule!r}, use one of {', '.join(RULES)}")
+        if book is not None and rule != "domino_game":
+            raise ValueError("Opening books are built with the domino_game rule")
+        self.max_entries = max_entries
+        self.rule = rule
+        self.book = book            # An opening_book.OpeningBook to start early positions from
+        self.cache = OrderedDict()  # Position: Analysis, least recently used first
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+        self.thinker = None
+        self.thinking = threading.Event()
+
+    def analysis(self, position):
+        """Get the cached Analysis of a position, creating it if needed"""
+        with self.lock:
+            entry = self.cache.get(position)
+            if entry is not None:
+                self.hits += 1
+                self.cache.move_to_end(position)
+                return entry
+            self.misses += 1
+            entry = self.cache[position] = Analysis(position, self.book, self.rule)
+            if len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+            return entry
+
+    def hints(self, position, budget_ms=20):
+        """Get the legal moves best first, analysing for up to budget_ms more first (0 just reads the cache)"""
+        entry = self.analysis(position)
+        if entry.moves:
+            deadline = time.perf_counter() + budget_ms / 1000
+            while time.perf_counter() < deadline:
+                with self.lock:
+                    entry.run_round(position, self.rng)
+        with self.lock:
+            return entry.ranked(tile_pips(position.max_pip))
+
+    def start_thinking(self, position, max_seconds=30):
+        """Keep analysing position in the background until stop_thinking() or max_seconds"""
+        self.stop_thinking()
+        entry = self.analysis(position)
+        if not entry.moves:
+            return
+        self.thinking.set()
+
+        def think():
+            deadline = time.perf_counter() + max_seconds
+            while self.thinking.is_set() and time.perf_counter() < deadline:
+                with self.lock:
+                    entry.run_round(position, self.rng)
+                # Let the player's thread have the interpreter between rounds
+                time.sleep(0)
+
+        self.thinker = threading.Thread(target=think, name="domino-hints", daemon=True)
+        self.thinker.start()
+
+    def stop_thinking(self):
+        self.thinking.clear()
+        if self.thinker is not None:
+            self.thinker.join()
+            self.thinker = None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.cache)}
+
+
+def format_hints(hints, limit=3):
+    """Get printable lines for the best hints"""
+    lines = []
+    for hint in hints[:limit]:
+        if hint.win_rate is None:
+            quality = "not analysed yet"
+        else:
+            quality = f"wins {hint.win_rate:.0%} of {hint.playouts} playouts"
+        lines.append(f"  tile {hint.tile}: | {hint.left} | {hint.right} | on the {hint.side} ({quality})")
+    return lines
+
+
+def benchmark(positions=200, budget_ms=20, seed=0):
+    """Time first answers, cached answers and how the ranking settles with more budget"""
+    import statistics
+    from domino_game import DominoGame
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    service = HintService(seed=seed)
+    samples = []
+    while len(samples) < positions:
+        # Stop a quiet game at a random turn and take the position of the player to move
+        game = DominoGame()
+        game.verbose = False
+        game.turn_delay = 0
+        game.setup_game()
+        stop = rng.randint(1, 12)
+        def stopper(event_type, data):
+            if event_type in ("tile_played", "pass") and len(game.move_history) >= stop:
+                game.game_over = True
+        game.event_listeners.append(stopper)
+        game.start_game()
+        # The stopped turn has already passed play to the next seat
+        if len(game.move_history) >= stop and game.passes_in_row < game.player_count \
+                and all(player.tiles_assigned for player in game.players):
+            samples.append(game_position(game))
+
+    first = []
+    cached = []
+    for position in samples:
+        start = time.perf_counter()
+        service.hints(position, budget_ms)
+        first.append(time.perf_counter() - start)
+    for position in samples:
+        start = time.perf_counter()
+        service.hints(position, 0)
+        cached.append(time.perf_counter() - start)
+
+    print("=== MOVE HINT BENCHMARK ===")
+    print(f"{positions} positions, {budget_ms} ms budget")
+    print(f"First hint:  median {statistics.median(first) * 1e3:.2f} ms")
+    print(f"Cached hint: median {statistics.median(cached) * 1e6:.0f} us")
+    playouts = [sum(hint.playouts for hint in service.hints(position, 0)) for position in samples]
+    print(f"Playouts per position: median {statistics.median(playouts):.0f}")
+    print(f"Cache: {service.stats()}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -6,14 +6,38 @@ This script provides multiple approaches for accurately cropping domino tiles
 from PIL import Image, ImageTk
 import os
 import json
+import time
+import tempfile
 
-def create_coordinate_template():
+from domino_game import MAX_PIP, tile_count
+
+# Output scales for the tile pyramid. 1x is the 115x208 source size and is
+# written straight into tiles/, every other scale gets its own sub folder
+TILE_SCALES = (1, 2, 0.5, 0.25)
+
+# Resampling filters that can be picked by name
+RESAMPLE_FILTERS = {
+    "nearest": Image.NEAREST,
+    "box": Image.BOX,
+    "bilinear": Image.BILINEAR,
+    "hamming": Image.HAMMING,
+    "bicubic": Image.BICUBIC,
+    "lanczos": Image.LANCZOS,
+}
+
+# Output formats: file extension and the save() options for each
+IMAGE_FORMATS = {
+    "png": ("png", {"optimize": True}),
+    "webp": ("webp", {"lossless": True, "quality": 100, "method": 6}),
+}
+
+def create_coordinate_template(max_pip=MAX_PIP):
     """Create a template file for manual coordinate input"""
     
     # Generate all domino combinations
     domino_tiles = []
-    for i in range(7):
-        for j in range(i, 7):
+    for i in range(max_pip + 1):
+        for j in range(i, max_pip + 1):
             domino_tiles.append((i, j))
     
     # Create coordinate template
@@ -43,7 +67,63 @@ def create_coordinate_template():
     print('    }')
     print('}')
 
-def crop_from_coordinates():
+def scale_dir(tiles_dir, scale):
+    """Get the folder that holds the tiles for one scale"""
+    if scale == 1:
+        return tiles_dir
+    return os.path.join(tiles_dir, f"{scale:g}x")
+
+def build_tile_pyramid(tile_set, coordinates, tiles_dir='tiles', scales=TILE_SCALES,
+                       resample="lanczos", image_format="png", skip_unset=True):
+    """
+    Crop every tile once and save it at each scale in one pass.
+    Returns per scale stats: {scale: {"count", "seconds", "bytes"}}
+    """
+    
+    resample_filter = RESAMPLE_FILTERS[resample]
+    extension, save_options = IMAGE_FORMATS[image_format]
+    
+    stats = {}
+    for scale in scales:
+        os.makedirs(scale_dir(tiles_dir, scale), exist_ok=True)
+        stats[scale] = {"count": 0, "seconds": 0.0, "bytes": 0}
+    
+    for tile_name, coords in coordinates.items():
+        left = coords['left']
+        top = coords['top']
+        width = coords['width']
+        height = coords['height']
+        
+        # Skip if coordinates are still default (0,0)
+        if skip_unset and left == 0 and top == 0:
+            print(f"Skipping {tile_name} - coordinates not set")
+            continue
+        
+        # Decode the crop once and share it between all the scales
+        tile_crop = tile_set.crop((left, top, left + width, top + height))
+        tile_crop.load()
+        
+        for scale in scales:
+            start = time.perf_counter()
+            
+            if scale == 1:
+                scaled = tile_crop
+            else:
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                # reducing_gap lets Pillow shrink by whole factors with reduce()
+                # before the real filter runs, which is a lot faster on downscales
+                scaled = tile_crop.resize(size, resample_filter, reducing_gap=2.0)
+            
+            filename = os.path.join(scale_dir(tiles_dir, scale), f"{tile_name}.{extension}")
+            scaled.save(filename, **save_options)
+            
+            stats[scale]["seconds"] += time.perf_counter() - start
+            stats[scale]["bytes"] += os.path.getsize(filename)
+            stats[scale]["count"] += 1
+    
+    return stats
+
+def crop_from_coordinates(scales=TILE_SCALES, resample="lanczos", image_format="png", max_pip=MAX_PIP):
     """Crop tiles using coordinates from JSON file"""
     
     if not os.path.exists('tile_coordinates.json'):
@@ -65,44 +145,23 @@ def crop_from_coordinates():
         if not os.path.exists(tiles_dir):
             os.makedirs(tiles_dir)
         
-        # Crop each tile
-        cropped_count = 0
-        for tile_name, coords in coordinates.items():
-            left = coords['left']
-            top = coords['top'] 
-            width = coords['width']
-            height = coords['height']
-            
-            # Skip if coordinates are still default (0,0)
-            if left == 0 and top == 0:
-                print(f"Skipping {tile_name} - coordinates not set")
-                continue
-            
-            # Calculate crop box
-            right = left + width
-            bottom = top + height
-            
-            # Crop the tile
-            tile_crop = tile_set.crop((left, top, right, bottom))
-            
-            # Save as PNG to preserve quality
-            filename = f"{tiles_dir}/{tile_name}.png"
-            tile_crop.save(filename)
-            
-            print(f"Cropped: {filename}")
-            cropped_count += 1
+        # Crop each tile at every scale
+        stats = build_tile_pyramid(tile_set, coordinates, tiles_dir, scales, resample, image_format)
+        cropped_count = stats[scales[0]]["count"] if scales else 0
         
         print(f"\nSuccessfully cropped {cropped_count} tiles!")
         
         # Create mapping file
-        create_tile_mapping_from_coords(coordinates)
+        create_tile_mapping_from_coords(coordinates, scales, image_format, max_pip)
         
     except Exception as e:
         print(f"Error cropping tiles: {e}")
 
-def create_tile_mapping_from_coords(coordinates):
+def create_tile_mapping_from_coords(coordinates, scales=(1,), image_format="png", max_pip=MAX_PIP):
     """Create tile mapping file from coordinates"""
     
+    extension = IMAGE_FORMATS[image_format][0]
+    
     mapping_content = '''"""
 Domino tile image mappings
 This file contains mappings from domino values to image filenames
@@ -114,20 +173,42 @@ TILE_IMAGES = {
     
     # Generate all domino combinations in order
     domino_tiles = []
-    for i in range(7):
-        for j in range(i, 7):
+    for i in range(max_pip + 1):
+        for j in range(i, max_pip + 1):
             domino_tiles.append((i, j))
     
-    for left_val, right_val in domino_tiles:
-        tile_name = f"tile_{left_val}_{right_val}"
-        if tile_name in coordinates:
-            mapping_content += f"    ({left_val}, {right_val}): 'tiles/{tile_name}.png',\n"
+    def tile_entries(scale):
+        entries = ''
+        folder = scale_dir('tiles', scale).replace(os.sep, '/')
+        for left_val, right_val in domino_tiles:
+            tile_name = f"tile_{left_val}_{right_val}"
+            if tile_name in coordinates:
+                entries += f"    ({left_val}, {right_val}): '{folder}/{tile_name}.{extension}',\n"
+        return entries
+    
+    mapping_content += tile_entries(1)
+    
+    mapping_content += '''}
+
+# Same mapping for every scale of the tile pyramid
+TILE_IMAGES_BY_SCALE = {
+'''
+    
+    for scale in sorted(set(scales) | {1}, reverse=True):
+        mapping_content += f"    {scale!r}: {{\n"
+        mapping_content += tile_entries(scale).replace('    (', '        (')
+        mapping_content += "    },\n"
     
     mapping_content += '''}
 
-def get_tile_image(left, right):
-    """Get the image filename for a domino tile"""
-    return TILE_IMAGES.get((left, right), None)
+def get_tile_image(left, right, scale=1):
+    """Get the image filename for a domino tile at the given scale"""
+    return TILE_IMAGES_BY_SCALE.get(scale, {}).get((left, right), None)
+
+def load_tile_image(left, right, rotation=0, flip=False, scale=1):
+    """Get the decoded image for a domino tile (cached, see tile_loader.py)"""
+    from tile_loader import load_tile_image as load
+    return load(left, right, rotation, flip, scale)
 
 def get_all_tile_images():
     """Get all tile image filenames"""
@@ -182,11 +263,42 @@ def quick_crop_known_tiles():
             print("Copied Tile0.png as tile_0_0.png")
         
         print("Quick crop completed!")
-        print("Now you need to manually locate and specify coordinates for the remaining 27 tiles")
+        print(f"Now you need to manually locate and specify coordinates for the remaining {tile_count(MAX_PIP) - 1} tiles")
         
     except Exception as e:
         print(f"Error in quick crop: {e}")
 
+def benchmark_scales(scales=TILE_SCALES, resample="lanczos", image_formats=("png", "webp")):
+    """Time the pyramid build and measure the total bytes written for each scale"""
+    
+    try:
+        with open('tile_coordinates.json', 'r') as f:
+            coordinates = json.load(f)
+        tile_set = Image.open('Tile_Set.jpg')
+        tile_set.load()
+    except Exception as e:
+        print(f"Error loading benchmark inputs: {e}")
+        return
+    
+    print("=== TILE PYRAMID BENCHMARK ===")
+    print(f"{len(coordinates)} tiles, resample={resample}")
+    
+    for image_format in image_formats:
+        # Write into a scratch folder so the real tiles/ folder is untouched.
+        # Unset (0,0) coordinates are still cropped, the timing is the same
+        with tempfile.TemporaryDirectory() as scratch:
+            start = time.perf_counter()
+            stats = build_tile_pyramid(tile_set, coordinates, scratch, scales,
+                                       resample, image_format, skip_unset=False)
+            total_seconds = time.perf_counter() - start
+        
+        print(f"\nFormat: {image_format} (total {total_seconds * 1000:.1f} ms)")
+        print(f"  {'scale':>6}  {'tiles':>5}  {'ms':>8}  {'bytes':>10}")
+        for scale in scales:
+            entry = stats[scale]
+            print(f"  {scale:>5g}x  {entry['count']:>5}  {entry['seconds'] * 1000:>8.1f}  {entry['bytes']:>10}")
+        print(f"  {'all':>6}  {'':>5}  {'':>8}  {sum(e['bytes'] for e in stats.values()):>10}")
+
 def show_instructions():
     """Show detailed instructions for manual cropping"""
     
@@ -224,6 +336,8 @@ if __name__ == "__main__":
     print("- create_coordinate_template(): Create JSON template for coordinates")
     print("- create_sample_coordinates(): Create sample coordinate file")
     print("- crop_from_coordinates(): Crop tiles using JSON coordinates")
+    print("  (scales=(1, 2, 0.5, 0.25), resample='lanczos', image_format='png' or 'webp')")
+    print("- benchmark_scales(): Time the multi-scale build and report bytes per scale")
     print("- quick_crop_known_tiles(): Copy your Tile0.png and set up structure")
     print("- show_instructions(): Show these instructions again")
     
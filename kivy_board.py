@@ -0,0 +1,331 @@
+"""
+Kivy board view for the domino game
+Draws the line of play from a DominoGame as batched canvas instructions that
+all sample one tile atlas texture. Only the newly placed tiles get new
+instructions, tiles outside the viewport are culled, and the board can be
+panned (drag) and zoomed (mouse wheel, double tap to fit) with per-frame
+timing built in. Tile positions come from board_layout.SnakeLayout
+"""
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.graphics import InstructionGroup, Rectangle, PushMatrix, PopMatrix, Translate, Scale
+from kivy.graphics.texture import Texture
+from kivy.uix.widget import Widget
+from PIL import Image
+from collections import deque
+import time
+
+from board_layout import SnakeLayout
+from domino_game import tile_catalog
+from game_worker import GameWorker, EventPacer
+from tile_loader import get_loader
+
+# 1x tile size in board units, tile images are stored standing up
+TILE_WIDTH = 115
+TILE_HEIGHT = 208
+
+# Tiles per row in the atlas texture
+ATLAS_COLUMNS = 7
+
+# Width the snake layout wraps at, in board units
+BOARD_WIDTH = 3200
+
+MIN_ZOOM = 0.05
+MAX_ZOOM = 4.0
+
+# Screen space kept free around the board when zooming to fit
+FIT_MARGIN = 40
+
+
+def build_tile_atlas(scale=0.5, loader=None):
+    """Paste every tile image into one texture, returns (texture, {(left, right): region})"""
+    loader = loader or get_loader()
+    tiles = sorted(loader.tile_images.get(scale, {}))
+    if not tiles:
+        print(f"Error: no tile images at scale {scale}")
+        return None, {}
+
+    width, height = loader.get(*tiles[0], scale=scale).size
+    rows = (len(tiles) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+    sheet = Image.new('RGB', (ATLAS_COLUMNS * width, rows * height))
+
+    positions = {}
+    for n, (left, right) in enumerate(tiles):
+        x = (n % ATLAS_COLUMNS) * width
+        y = (n // ATLAS_COLUMNS) * height
+        sheet.paste(loader.get(left, right, scale=scale).convert('RGB'), (x, y))
+        positions[(left, right)] = (x, y)
+
+    # Kivy textures start at the bottom row, PIL images at the top row
+    sheet = sheet.transpose(Image.FLIP_TOP_BOTTOM)
+    texture = Texture.create(size=sheet.size, colorfmt='rgb', mipmap=True)
+    texture.blit_buffer(sheet.tobytes(), colorfmt='rgb', bufferfmt='ubyte')
+    texture.min_filter = 'linear_mipmap_linear'
+
+    regions = {}
+    for key, (x, y) in positions.items():
+        regions[key] = texture.get_region(x, sheet.height - y - height, width, height)
+    return texture, regions
+
+
+def missing_tiles(max_pip, scale=0.5, loader=None):
+    """Get the tiles of a double-max_pip set with no image at scale either way round"""
+    loader = loader or get_loader()
+    images = loader.tile_images.get(scale, {})
+    return [(tile.left, tile.right) for tile in tile_catalog(max_pip)
+            if (tile.left, tile.right) not in images and (tile.right, tile.left) not in images]
+
+
+def rotate_tex_coords(tex_coords, quarter_turns):
+    """Turn a region's tex_coords counter-clockwise by 90 degree steps"""
+    corners = [tex_coords[i:i + 2] for i in range(0, 8, 2)]
+    rotated = []
+    for i in range(4):
+        rotated.extend(corners[(i - quarter_turns) % 4])
+    return tuple(rotated)
+
+
+def tile_quarter_turns(first, second, vertical):
+    """
+    Get (image key, quarter turns) to draw a tile with first shown on the
+    left (or on top when vertical). Images have the low number on top, so a
+    quarter turn counter-clockwise puts the top half on the left
+    """
+    if vertical:
+        if first <= second:
+            return (first, second), 0
+        return (second, first), 2
+    if first <= second:
+        return (first, second), 1
+    return (second, first), 3
+
+
+class FrameStats:
+    def __init__(self, history=600):
+        self.frame_times = deque(maxlen=history)
+        self.work_times = deque(maxlen=history)
+
+    def record_frame(self, dt):
+        self.frame_times.append(dt)
+
+    def record_work(self, seconds):
+        self.work_times.append(seconds)
+
+    def summary(self):
+        """Get fps and frame time figures (milliseconds) for the recent frames"""
+        if not self.frame_times:
+            return {"frames": 0}
+        frames = sorted(self.frame_times)
+        average = sum(frames) / len(frames)
+        return {
+            "frames": len(frames),
+            "fps": 1.0 / average if average else 0.0,
+            "avg_ms": average * 1000,
+            "p95_ms": frames[min(len(frames) - 1, int(len(frames) * 0.95))] * 1000,
+            "worst_ms": frames[-1] * 1000,
+            "work_avg_ms": sum(self.work_times) / max(1, len(self.work_times)) * 1000,
+        }
+
+
+class BoardView(Widget):
+    def __init__(self, game, scale=0.5, **kwargs):
+        super().__init__(**kwargs)
+        # Anything with a move_history: a DominoGame or an EventPacer
+        self.game = game
+        self.texture, self.regions = build_tile_atlas(scale)
+
+        # One entry per placed tile: [x, y, width, height, Rectangle, visible]
+        self.tiles = []
+        self.layout = SnakeLayout(TILE_HEIGHT, TILE_WIDTH, BOARD_WIDTH)
+
+        self.zoom = 0.5
+        self.target_zoom = self.zoom
+        self.pan_x = 0
+        self.pan_y = 0
+        # Keep the whole board in view until the player pans or zooms by hand
+        self.auto_fit = True
+        self.focus = (0, 0)
+        self.viewport_dirty = True
+        self.frame_stats = FrameStats()
+
+        # Every tile goes in one group between a single transform push/pop
+        self.tile_group = InstructionGroup()
+        with self.canvas.before:
+            PushMatrix()
+            self.translate = Translate()
+            self.scale = Scale(self.zoom)
+        self.canvas.add(self.tile_group)
+        with self.canvas.after:
+            PopMatrix()
+
+        self.bind(pos=self.mark_dirty, size=self.mark_dirty)
+        Clock.schedule_interval(self.update, 0)
+
+    def mark_dirty(self, *args):
+        self.viewport_dirty = True
+        if self.auto_fit:
+            self.fit_board()
+
+    def update(self, dt):
+        """Per-frame work: pick up new moves, animate zoom, re-cull if the view moved"""
+        start = time.perf_counter()
+        self.frame_stats.record_frame(dt)
+
+        if self.sync() and self.auto_fit:
+            self.fit_board()
+
+        if abs(self.target_zoom - self.zoom) > 1e-4:
+            self.zoom += (self.target_zoom - self.zoom) * min(1.0, dt * 12)
+            self.viewport_dirty = True
+
+        if self.auto_fit:
+            pan = (-self.focus[0] * self.zoom, -self.focus[1] * self.zoom)
+            if pan != (self.pan_x, self.pan_y):
+                self.pan_x, self.pan_y = pan
+                self.viewport_dirty = True
+
+        if self.viewport_dirty:
+            self.apply_transform()
+            self.cull()
+            self.viewport_dirty = False
+
+        self.frame_stats.record_work(time.perf_counter() - start)
+
+    def sync(self):
+        """Add instructions for moves made since the last sync, returns how many"""
+        history = self.game.move_history
+        new_moves = history[len(self.tiles):]
+        for player_index, left, right, side in new_moves:
+            self.add_tile(left, right, side)
+        return len(new_moves)
+
+    def add_tile(self, left, right, side):
+        """Lay out one newly placed tile and create its instruction"""
+        tile = self.layout.add_tile(left, right, side)
+        key, quarter_turns = tile_quarter_turns(tile.first, tile.second, tile.vertical)
+        region = self.regions[key]
+        rect = Rectangle(pos=(tile.x, tile.y), size=(tile.width, tile.height), texture=region,
+                         tex_coords=rotate_tex_coords(region.tex_coords, quarter_turns))
+
+        visible = self.intersects_viewport(tile.x, tile.y, tile.width, tile.height)
+        if visible:
+            self.tile_group.add(rect)
+        self.tiles.append([tile.x, tile.y, tile.width, tile.height, rect, visible])
+
+    def fit_board(self):
+        """Aim the zoom and pan at the layout's bounding box"""
+        x0, y0, x1, y1 = self.layout.bounding_box()
+        if x1 <= x0 or y1 <= y0:
+            return
+        zoom = min((self.width - 2 * FIT_MARGIN) / (x1 - x0), (self.height - 2 * FIT_MARGIN) / (y1 - y0))
+        self.target_zoom = max(MIN_ZOOM, min(MAX_ZOOM, zoom))
+        self.focus = ((x0 + x1) / 2, (y0 + y1) / 2)
+
+    def apply_transform(self):
+        self.translate.xy = (self.center_x + self.pan_x, self.center_y + self.pan_y)
+        self.scale.xyz = (self.zoom, self.zoom, 1)
+
+    def viewport(self):
+        """Get the visible area in board units as (x0, y0, x1, y1)"""
+        origin_x = self.center_x + self.pan_x
+        origin_y = self.center_y + self.pan_y
+        return ((self.x - origin_x) / self.zoom, (self.y - origin_y) / self.zoom,
+                (self.right - origin_x) / self.zoom, (self.top - origin_y) / self.zoom)
+
+    def intersects_viewport(self, x, y, width, height):
+        x0, y0, x1, y1 = self.viewport()
+        return x < x1 and x + width > x0 and y < y1 and y + height > y0
+
+    def cull(self):
+        """Only keep the tiles that overlap the viewport in the canvas"""
+        x0, y0, x1, y1 = self.viewport()
+        for entry in self.tiles:
+            x, y, width, height, rect, visible = entry
+            now_visible = x < x1 and x + width > x0 and y < y1 and y + height > y0
+            if now_visible != visible:
+                if now_visible:
+                    self.tile_group.add(rect)
+                else:
+                    self.tile_group.remove(rect)
+                entry[5] = now_visible
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return False
+        if touch.is_mouse_scrolling:
+            self.auto_fit = False
+            if touch.button == 'scrolldown':
+                self.target_zoom = min(MAX_ZOOM, self.target_zoom * 1.1)
+            elif touch.button == 'scrollup':
+                self.target_zoom = max(MIN_ZOOM, self.target_zoom / 1.1)
+            return True
+        if touch.is_double_tap:
+            # Double tap goes back to following the whole board
+            self.auto_fit = True
+            self.fit_board()
+            return True
+        touch.grab(self)
+        return True
+
+    def on_touch_move(self, touch):
+        if touch.grab_current is not self:
+            return False
+        self.auto_fit = False
+        self.pan_x += touch.dx
+        self.pan_y += touch.dy
+        self.viewport_dirty = True
+        return True
+
+    def on_touch_up(self, touch):
+        if touch.grab_current is not self:
+            return False
+        touch.ungrab(self)
+        return True
+
+
+class BoardApp(App):
+    def __init__(self, game, turn_delay=0.5, **kwargs):
+        super().__init__(**kwargs)
+        self.game = game
+        self.board_view = None
+        # The engine plays on a worker thread, the app shows its moves at its own pace
+        self.worker = GameWorker(game)
+        self.pacer = EventPacer(self.worker, turn_delay)
+
+    def build(self):
+        self.title = "Domino Game"
+        self.board_view = BoardView(self.pacer)
+        Clock.schedule_interval(self.pace, 0)
+        self.worker.start()
+        return self.board_view
+
+    def pace(self, dt):
+        for event in self.pacer.update(dt):
+            if event.type == "game_over":
+                winner = event.data["winner"]
+                if winner is None:
+                    self.title = "Domino Game - game over"
+                else:
+                    self.title = f"Domino Game - {self.game.players[winner].name} wins!"
+            elif event.type == "error":
+                # The engine thread crashed, the game won't go on
+                self.title = "Domino Game - engine error"
+                print(f"Error: the game engine stopped: {event.data['message']}")
+
+    def on_stop(self):
+        # Let the engine finish its turn so the game isn't changing after run() returns
+        self.worker.stop()
+        self.worker.join(1)
+        print(f"Frame stats: {self.board_view.frame_stats.summary()}")
+
+
+def run_board_app(game, turn_delay=0.5):
+    """Open a window and play a set up DominoGame in it"""
+    # Without this the first move would fail inside the Kivy clock
+    missing = missing_tiles(game.max_pip)
+    if missing:
+        raise RuntimeError(f"No 0.5x tile images for {len(missing)} of the {len(tile_catalog(game.max_pip))} "
+                           f"tiles of a double-{game.max_pip} set. Run the cropping tool "
+                           f"(improved_crop_tiles.py) first")
+    BoardApp(game, turn_delay).run()
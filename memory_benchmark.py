@@ -0,0 +1,102 @@
+"""
+Memory benchmark for many live games
+Sets up 10k and 100k DominoGame instances at once (dealt, not yet played) and
+reports the memory each one holds on top of what all games share. The
+"before" column is the layout the engine used to have, every game building
+its own Tile objects with an owner field and plain Players, rebuilt here by
+LegacyGame so both figures come from the same run
+"""
+
+import gc
+import random
+import time
+import tracemalloc
+
+from domino_game import DominoGame, PLAYER_NAMES
+
+GAME_COUNTS = (10_000, 100_000)
+
+
+class LegacyTile:
+    """A Tile as it was before the shared catalog: one per game, owner in its __dict__"""
+
+    def __init__(self, left, right, assigned):
+        self.left = left
+        self.right = right
+        self.assigned = assigned
+
+
+class LegacyPlayer:
+    """A Player without __slots__"""
+
+    def __init__(self, name, tiles_assigned):
+        self.name = name
+        self.tiles_assigned = tiles_assigned
+
+
+class LegacyGame(DominoGame):
+    """Sets up a game with the old per-game tiles, only for measuring it"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tiles = []
+        del self.owners
+
+    def generate_tiles(self):
+        self.tiles = []
+        for i in range(0, self.max_pip + 1):
+            for k in range(i, self.max_pip + 1):
+                self.tiles.append(LegacyTile(i, k, 0))
+
+    def create_players(self):
+        self.players = []
+        for player_index in range(self.player_count):
+            if player_index < len(PLAYER_NAMES):
+                name = PLAYER_NAMES[player_index]
+            else:
+                name = f"Player {player_index + 1}"
+            self.players.append(LegacyPlayer(name, 0))
+
+    def assign_tiles(self):
+        dealt = random.sample(range(len(self.tiles)), self.hand_size * self.player_count)
+        for player_index in range(self.player_count):
+            for tile_index in dealt[player_index * self.hand_size:(player_index + 1) * self.hand_size]:
+                self.tiles[tile_index].assigned = player_index + 1
+            self.players[player_index].tiles_assigned = self.hand_size
+
+
+def live_game_bytes(count, game_class=DominoGame, max_pip=6, player_count=4):
+    """Get (bytes per game, setup seconds) with count set up games alive at once"""
+    random.seed(count)
+    # Anything games share (the tile catalog) is built by this first game
+    game_class(max_pip, player_count).setup_game()
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    games = []
+    for _ in range(count):
+        game = game_class(max_pip, player_count)
+        game.setup_game()
+        games.append(game)
+    seconds = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # Don't count the list holding the games
+    used -= games.__sizeof__()
+    return used / count, seconds
+
+
+def benchmark_memory():
+    print("=== LIVE GAME MEMORY BENCHMARK ===")
+    print(f"{'games':>8}  {'before B/game':>13}  {'after B/game':>12}  {'before MB':>9}  {'after MB':>8}  {'setup s':>8}")
+    for count in GAME_COUNTS:
+        legacy, _ = live_game_bytes(count, LegacyGame)
+        per_game, seconds = live_game_bytes(count)
+        print(f"{count:>8,}  {legacy:>13.0f}  {per_game:>12.0f}  {legacy * count / 1e6:>9.1f}  "
+              f"{per_game * count / 1e6:>8.1f}  {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    benchmark_memory()
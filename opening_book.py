@@ -0,0 +1,313 @@
+"""
+Opening book
+Self-play statistics for the first moves after the opening double, the most
+common positions of every game. A position is keyed by what everybody can
+see: the tiles on the board, the two open ends as they lie and the tile
+counts from the mover's seat. For each key
+the book holds every move that was tried with how many games it was played
+in and how many of those the mover won.
+
+Books are flat files of fixed size records sorted by key and move, read
+through mmap and searched with a binary search. Books built by separate runs
+(processes, machines) are merged with a streaming k-way merge.
+
+Self-play deals like DominoGame, opens with the highest double and lets the
+opener move again the way start_game does. Within the book depth every seat
+picks a random legal move so alternatives get explored, after that the
+engine's first-valid-tile rule plays the game out
+"""
+
+from collections import namedtuple
+import heapq
+import mmap
+import os
+import random
+import struct
+
+from domino_game import default_hand_size, tile_count
+from hint_service import legal_moves, place, tile_pips
+
+DEFAULT_BOOK = 'opening_book.bin'
+DEFAULT_DEPTH = 8   # Moves after the opening double that go into the book
+
+# magic, max_pip, player count, depth, record count
+HEADER = struct.Struct('<4sBBBxI')
+MAGIC = b'DOB2'   # DOB1 books keyed mirrored boards together
+
+# After the key: tile, side (0 left, 1 right), games, wins
+MOVE = struct.Struct('<BBII')
+SIDES = ("left", "right")
+
+BookMove = namedtuple('BookMove', ['tile', 'left', 'right', 'side', 'games', 'win_rate'])
+
+
+def key_size(max_pip, player_count):
+    return (tile_count(max_pip) + 7) // 8 + 2 + player_count
+
+def position_key(max_pip, played, left, right, hand_counts):
+    """Get the key bytes of a position"""
+    # Big endian so the byte order of keys is the numeric order of the boards
+    return played.to_bytes((tile_count(max_pip) + 7) // 8, 'big') + bytes((left, right)) + bytes(hand_counts)
+
+
+def self_play(games, max_pip=6, player_count=4, depth=DEFAULT_DEPTH, seed=None):
+    """Play games and get {(key, tile, side): [games, wins]} for the moves within depth"""
+    rng = random.Random(seed)
+    tiles = tile_pips(max_pip)
+    hand_size = default_hand_size(max_pip, player_count)
+    doubles = [i for i, (a, b) in enumerate(tiles) if a == b]
+    stats = {}
+
+    for _ in range(games):
+        deal = rng.sample(range(len(tiles)), hand_size * player_count)
+        hands = [sorted(deal[seat * hand_size:(seat + 1) * hand_size]) for seat in range(player_count)]
+        dealt = set(deal)
+        opening = next((i for i in reversed(doubles) if i in dealt), None)
+        if opening is None:
+            continue
+        seat = next(seat for seat in range(player_count) if opening in hands[seat])
+        hands[seat].remove(opening)
+        left = right = tiles[opening][0]
+        played = 1 << opening
+
+        # Book moves of this game as (stats key, seat)
+        moves = []
+        passes = 0
+        winner = None
+        while True:
+            hand = hands[seat]
+            choice = None
+            if len(moves) < depth:
+                mask = 0
+                for i in hand:
+                    mask |= 1 << i
+                options = legal_moves(tiles, mask, left, right)
+                if options:
+                    i, side = rng.choice(options)
+                    counts = [len(h) for h in hands]
+                    key = position_key(max_pip, played, left, right, counts[seat:] + counts[:seat])
+                    moves.append(((key, i, SIDES.index(side)), seat))
+                    choice = i
+                    left, right = place(tiles[i], side, left, right)
+            else:
+                for i in hand:
+                    a, b = tiles[i]
+                    if a == left or b == left or a == right or b == right:
+                        choice = i
+                        left, right = place(tiles[i], "left" if left in (a, b) else "right", left, right)
+                        break
+
+            if choice is None:
+                passes += 1
+                if passes >= player_count:
+                    break
+            else:
+                passes = 0
+                hand.remove(choice)
+                played |= 1 << choice
+                if not hand:
+                    winner = seat
+                    break
+            seat = (seat + 1) % player_count
+
+        for move, mover in moves:
+            entry = stats.get(move)
+            if entry is None:
+                entry = stats[move] = [0, 0]
+            entry[0] += 1
+            if mover == winner:
+                entry[1] += 1
+    return stats
+
+
+def write_book(path, records, max_pip, player_count, depth):
+    """Write sorted (key and move bytes, games, wins) records, returns how many were written"""
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, max_pip, player_count, depth, 0))
+        for prefix, games, wins in records:
+            f.write(prefix + MOVE.pack(0, 0, games, wins)[2:])
+            count += 1
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, max_pip, player_count, depth, count))
+    return count
+
+
+def build_book(path=DEFAULT_BOOK, games=100_000, max_pip=6, player_count=4, depth=DEFAULT_DEPTH, seed=None):
+    """Self-play games and write them as a book"""
+    stats = self_play(games, max_pip, player_count, depth, seed)
+    records = ((key + bytes((tile, side)), games_played, wins)
+               for (key, tile, side), (games_played, wins) in sorted(stats.items()))
+    return write_book(path, records, max_pip, player_count, depth)
+
+
+def read_records(path):
+    """Get (header fields, iterator of (key and move bytes, games, wins)) from a book file"""
+    f = open(path, 'rb')
+    magic, max_pip, player_count, depth, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        f.close()
+        raise ValueError(f"{path} is not an opening book")
+    prefix_size = key_size(max_pip, player_count) + 2
+    record_size = prefix_size + MOVE.size - 2
+
+    def records():
+        with f:
+            for _ in range(count):
+                record = f.read(record_size)
+                games, wins = struct.unpack_from('<II', record, prefix_size)
+                yield record[:prefix_size], games, wins
+    return (max_pip, player_count, depth), records()
+
+
+def merge_books(path, inputs):
+    """Merge books from separate runs into one, adding up the games and wins of matching moves"""
+    headers = []
+    streams = []
+    for input_path in inputs:
+        header, records = read_records(input_path)
+        headers.append(header)
+        streams.append(records)
+    if len(set(headers)) > 1:
+        raise ValueError("Books for different sets, player counts or depths can't be merged")
+
+    def merged():
+        current = None
+        for prefix, games, wins in heapq.merge(*streams):
+            if current is not None and current[0] == prefix:
+                current[1] += games
+                current[2] += wins
+            else:
+                if current is not None:
+                    yield current
+                current = [prefix, games, wins]
+        if current is not None:
+            yield current
+
+    return write_book(path, merged(), *headers[0])
+
+
+def build_parallel(path=DEFAULT_BOOK, games=100_000, runs=4, processes=None, max_pip=6, player_count=4,
+                   depth=DEFAULT_DEPTH, seed=0):
+    """Build runs part books (in a process pool when processes > 1) and merge them into path"""
+    parts = [f"{path}.part{n}" for n in range(runs)]
+    jobs = [(part, games // runs, max_pip, player_count, depth, seed + n) for n, part in enumerate(parts)]
+    if processes and processes > 1:
+        from multiprocessing import Pool
+        with Pool(processes) as pool:
+            pool.starmap(build_book, jobs)
+    else:
+        for job in jobs:
+            build_book(*job)
+    count = merge_books(path, parts)
+    for part in parts:
+        os.remove(part)
+    return count
+
+
+class OpeningBook:
+    def __init__(self, path=DEFAULT_BOOK):
+        self.file = open(path, 'rb')
+        self.table = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.max_pip, self.player_count, self.depth, self.count = HEADER.unpack_from(self.table, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an opening book")
+        self.key_size = key_size(self.max_pip, self.player_count)
+        self.record_size = self.key_size + MOVE.size
+        self.tiles = tile_pips(self.max_pip)
+
+    def record_key(self, n):
+        offset = HEADER.size + n * self.record_size
+        return self.table[offset:offset + self.key_size]
+
+    def find(self, key):
+        """Get the index of the first record with key (or where it would go)"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.record_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lookup(self, position):
+        """Get the BookMoves of a hint_service.Position, best win rate first (empty if it isn't in the book)"""
+        if position.max_pip != self.max_pip or len(position.hand_counts) != self.player_count \
+                or position.left is None:
+            return []
+        key = position_key(self.max_pip, position.played, position.left, position.right, position.hand_counts)
+
+        moves = []
+        n = self.find(key)
+        while n < self.count and self.record_key(n) == key:
+            tile, side, games, wins = MOVE.unpack_from(self.table, HEADER.size + n * self.record_size + self.key_size)
+            moves.append(BookMove(tile, *self.tiles[tile], SIDES[side], games, wins / games))
+            n += 1
+        moves.sort(key=lambda move: -move.win_rate)
+        return moves
+
+    def best_move(self, position, min_games=20):
+        """Get the best BookMove the player can make from their hand, or None"""
+        for move in self.lookup(position):
+            if position.hand >> move.tile & 1 and move.games >= min_games:
+                return move
+        return None
+
+    def close(self):
+        self.table.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def benchmark(games=200_000, runs=4, seed=0):
+    """Build a book from parallel runs, then time lookups of positions from real games"""
+    import statistics
+    import time
+    from domino_game import DominoGame
+    from hint_service import game_position
+
+    print("=== OPENING BOOK BENCHMARK ===")
+    start = time.perf_counter()
+    count = build_parallel(DEFAULT_BOOK, games, runs, os.cpu_count(), seed=seed)
+    seconds = time.perf_counter() - start
+    print(f"Built from {games:,} games in {runs} runs: {count:,} moves, "
+          f"{os.path.getsize(DEFAULT_BOOK) / 1e6:.1f} MB in {seconds:.1f} s")
+
+    # Positions from the first turns of quiet engine games, stopped after a few tiles
+    random.seed(seed + 1)
+    positions = []
+    while len(positions) < 300:
+        game = DominoGame()
+        game.verbose = False
+        game.turn_delay = 0
+        game.setup_game()
+        stop = random.randint(1, 5)
+        def stopper(event_type, data):
+            if len(game.move_history) >= stop:
+                game.game_over = True
+        game.event_listeners.append(stopper)
+        game.start_game()
+        if len(game.move_history) >= stop and all(player.tiles_assigned for player in game.players):
+            positions.append(game_position(game))
+
+    with OpeningBook() as book:
+        found = 0
+        times = []
+        for position in positions:
+            start = time.perf_counter()
+            moves = book.lookup(position)
+            times.append(time.perf_counter() - start)
+            found += bool(moves)
+        print(f"Lookup: median {statistics.median(times) * 1e6:.1f} us, "
+              f"{found / len(positions):.0%} of {len(positions)} early positions found")
+
+
+if __name__ == "__main__":
+    benchmark()
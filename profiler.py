@@ -0,0 +1,134 @@
+"""
+Game loop profiler
+Named spans (deal, move_generation, strategy, placement, rendering, win_check,
+...) and counters for the game engine. Span times go into power of two
+histograms per name and into a folded stack table, which can be written as
+JSON or as a flamegraph.pl / speedscope compatible "folded" file.
+
+Profiling is off unless a Profiler is given to the game, the engine then uses
+a no-op stand in and never imports this module
+"""
+
+from time import perf_counter_ns
+import json
+import threading
+
+# Histogram bucket n counts spans that took less than 2**n nanoseconds
+BUCKETS = 64
+
+
+class Span:
+    __slots__ = ('profiler', 'name', 'start', 'child_ns')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.child_ns = 0
+        self.profiler.stack().append(self)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = perf_counter_ns() - self.start
+        stack = self.profiler.stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_ns += elapsed
+        path = ';'.join([span.name for span in stack] + [self.name])
+        self.profiler.record(self.name, path, elapsed, elapsed - self.child_ns)
+        return False
+
+
+class Profiler:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.histograms = {}  # name: [count, total_ns, min_ns, max_ns, buckets]
+        self.folded = {}      # "outer;inner" stack: self time in ns
+        self.counters = {}
+
+    def stack(self):
+        """Get the open spans of the calling thread"""
+        stack = getattr(self.local, 'spans', None)
+        if stack is None:
+            stack = self.local.spans = []
+        return stack
+
+    def span(self, name):
+        """Time a block: with profiler.span("placement"): ..."""
+        return Span(self, name)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, name, path, elapsed_ns, self_ns):
+        with self.lock:
+            entry = self.histograms.get(name)
+            if entry is None:
+                entry = self.histograms[name] = [0, 0, elapsed_ns, elapsed_ns, [0] * BUCKETS]
+            entry[0] += 1
+            entry[1] += elapsed_ns
+            entry[2] = min(entry[2], elapsed_ns)
+            entry[3] = max(entry[3], elapsed_ns)
+            entry[4][min(BUCKETS - 1, elapsed_ns.bit_length())] += 1
+            self.folded[path] = self.folded.get(path, 0) + self_ns
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.folded.clear()
+            self.counters.clear()
+
+    def summary(self):
+        """Get the span statistics (microseconds) and counters as a dict"""
+        with self.lock:
+            spans = {}
+            for name, (count, total, low, high, buckets) in self.histograms.items():
+                spans[name] = {
+                    "count": count,
+                    "total_ms": total / 1e6,
+                    "mean_us": total / count / 1e3,
+                    "min_us": low / 1e3,
+                    "max_us": high / 1e3,
+                    # Bucket bounds can lie outside what was measured
+                    "p50_us": min(max(bucket_percentile(buckets, count, 0.50), low), high) / 1e3,
+                    "p95_us": min(max(bucket_percentile(buckets, count, 0.95), low), high) / 1e3,
+                    # Upper bound of each bucket in microseconds: spans in it
+                    "histogram": {f"{(1 << n) / 1e3:g}": hits for n, hits in enumerate(buckets) if hits},
+                }
+            return {"spans": spans, "counters": dict(self.counters)}
+
+    def dump_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=4)
+
+    def dump_folded(self, path):
+        """Write "outer;inner self_time_us" lines for flamegraph.pl or speedscope"""
+        with self.lock:
+            lines = [f"{stack} {self_ns // 1000}" for stack, self_ns in sorted(self.folded.items())]
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def report(self):
+        """Print the span table"""
+        summary = self.summary()
+        print(f"{'span':<16} {'count':>7} {'total ms':>9} {'mean us':>8} {'p95 us':>8} {'max us':>8}")
+        for name, stats in sorted(summary["spans"].items(), key=lambda item: -item[1]["total_ms"]):
+            print(f"{name:<16} {stats['count']:>7} {stats['total_ms']:>9.2f} {stats['mean_us']:>8.1f} "
+                  f"{stats['p95_us']:>8.1f} {stats['max_us']:>8.1f}")
+        for name, value in sorted(summary["counters"].items()):
+            print(f"{name:<16} {value:>7}")
+
+
+def bucket_percentile(buckets, count, fraction):
+    """Get the upper bound (ns) of the bucket that holds the given percentile"""
+    target = count * fraction
+    seen = 0
+    for n, hits in enumerate(buckets):
+        seen += hits
+        if seen >= target:
+            return 1 << n
+    return 1 << (BUCKETS - 1)
@@ -0,0 +1,339 @@
+"""
+Results and rating store
+Keeps game outcomes in a local SQLite file and rates the players (or the
+strategies playing them, anything with a name) with Elo and TrueSkill.
+Results are buffered and written in batches, one transaction each, and
+ratings are worked out in bulk over every game not rated yet and written
+back in a single transaction. Leaderboards are read straight off indexes on
+the players table.
+
+Games have any number of seats. Seats with the same name (copies of one
+strategy playing each other) are one side and get rated once per game. The
+winning side beats every other side and a blocked game (no winner) is a draw
+between all of them. TrueSkill is the two player update applied to each of
+those pairs, a common approximation of the full multiplayer factor graph
+"""
+
+from collections import namedtuple
+from itertools import groupby
+import math
+import sqlite3
+from statistics import NormalDist
+
+DEFAULT_DB = 'results.db'
+
+# players: names by seat, winner: seat index or None, reason as in the game_over event
+GameResult = namedtuple('GameResult', ['players', 'winner', 'reason', 'turns', 'max_pip'])
+
+ELO_START = 1500.0
+ELO_K = 24.0
+
+TRUESKILL_MU = 25.0
+TRUESKILL_SIGMA = TRUESKILL_MU / 3
+TRUESKILL_BETA = TRUESKILL_SIGMA / 2
+TRUESKILL_TAU = TRUESKILL_SIGMA / 100
+DRAW_PROBABILITY = 0.10
+
+# Leaderboard orderings, each one matches an index expression exactly
+RATING_ORDER = {
+    "elo": "elo",
+    "trueskill": "mu - 3 * sigma",
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    elo REAL NOT NULL DEFAULT {ELO_START},
+    mu REAL NOT NULL DEFAULT {TRUESKILL_MU},
+    sigma REAL NOT NULL DEFAULT {TRUESKILL_SIGMA}
+);
+CREATE INDEX IF NOT EXISTS players_elo ON players (elo);
+CREATE INDEX IF NOT EXISTS players_trueskill ON players (mu - 3 * sigma);
+
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    winner INTEGER,
+    reason TEXT NOT NULL,
+    turns INTEGER NOT NULL,
+    max_pip INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seats (
+    game_id INTEGER NOT NULL,
+    seat INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    PRIMARY KEY (game_id, seat)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def normal_pdf(x):
+    return math.exp(-x * x / 2) / math.sqrt(2 * math.pi)
+
+def normal_cdf(x):
+    return (1 + math.erf(x / math.sqrt(2))) / 2
+
+# Performance gap under which a game counts as a draw
+DRAW_MARGIN = math.sqrt(2) * TRUESKILL_BETA * NormalDist().inv_cdf((DRAW_PROBABILITY + 1) / 2)
+
+
+def elo_pair(winner, loser, draw, k):
+    """Get the Elo change of the first player of a pair"""
+    expected = 1 / (1 + 10 ** ((loser - winner) / 400))
+    return k * ((0.5 if draw else 1.0) - expected)
+
+def trueskill_pair(mu_a, sigma_a, mu_b, sigma_b, draw):
+    """Get (mu_a, sigma_a, mu_b, sigma_b) after a beat b (or drew with it)"""
+    var_a = sigma_a * sigma_a
+    var_b = sigma_b * sigma_b
+    c = math.sqrt(2 * TRUESKILL_BETA * TRUESKILL_BETA + var_a + var_b)
+    t = (mu_a - mu_b) / c
+    e = DRAW_MARGIN / c
+    if draw:
+        p = normal_cdf(e - t) - normal_cdf(-e - t)
+        if p < 1e-12:
+            return mu_a, sigma_a, mu_b, sigma_b
+        v = (normal_pdf(-e - t) - normal_pdf(e - t)) / p
+        w = v * v + ((e - t) * normal_pdf(e - t) + (e + t) * normal_pdf(e + t)) / p
+    else:
+        p = normal_cdf(t - e)
+        if p < 1e-12:
+            v = e - t
+        else:
+            v = normal_pdf(t - e) / p
+        w = v * (v + t - e)
+    return (mu_a + var_a / c * v, sigma_a * math.sqrt(max(1 - var_a / (c * c) * w, 1e-6)),
+            mu_b - var_b / c * v, sigma_b * math.sqrt(max(1 - var_b / (c * c) * w, 1e-6)))
+
+
+class ResultsStore:
+    def __init__(self, path=DEFAULT_DB, batch_size=10_000):
+        self.path = path
+        self.batch_size = batch_size
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(SCHEMA)
+        self.player_ids = dict(self.db.execute("SELECT name, id FROM players"))
+        self.pending = []
+
+    def add_game(self, result):
+        """Queue a GameResult, it's written with the next batch"""
+        if len(result.players) < 2:
+            raise ValueError(f"A rated game needs at least 2 seats, got {len(result.players)}")
+        self.pending.append(result)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def add_games(self, results):
+        for result in results:
+            self.add_game(result)
+
+    def flush(self):
+        """Write the queued results in one transaction"""
+        if not self.pending:
+            return
+        results, self.pending = self.pending, []
+        with self.db:
+            new_names = {name for result in results for name in result.players if name not in self.player_ids}
+            if new_names:
+                last_player = self.db.execute("SELECT COALESCE(MAX(id), 0) FROM players").fetchone()[0]
+                self.db.executemany("INSERT INTO players (name) VALUES (?)", [(name,) for name in sorted(new_names)])
+                self.player_ids.update(self.db.execute("SELECT name, id FROM players WHERE id > ?", (last_player,)))
+
+            first_id = self.db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM games").fetchone()[0]
+            self.db.executemany("INSERT INTO games (id, winner, reason, turns, max_pip) VALUES (?, ?, ?, ?, ?)",
+                                [(first_id + n, result.winner, result.reason, result.turns, result.max_pip)
+                                 for n, result in enumerate(results)])
+            player_ids = self.player_ids
+            self.db.executemany("INSERT INTO seats (game_id, seat, player_id) VALUES (?, ?, ?)",
+                                [(first_id + n, seat, player_ids[name])
+                                 for n, result in enumerate(results)
+                                 for seat, name in enumerate(result.players)])
+
+    def listen(self, game, names=None):
+        """Record a DominoGame's result when it ends, names default to the players' names"""
+        turns = 0
+        def on_event(event_type, data):
+            nonlocal turns
+            if event_type in ("tile_played", "pass"):
+                turns += 1
+            elif event_type == "game_over":
+                players = names or [player.name for player in game.players]
+                self.add_game(GameResult(players, data["winner"], data["reason"], turns, game.max_pip))
+        game.event_listeners.append(on_event)
+        return on_event
+
+    def update_ratings(self):
+        """Rate every game added since the last update, returns how many were rated"""
+        self.flush()
+        rated = self.db.execute("SELECT value FROM meta WHERE key = 'rated_game'").fetchone()
+        rated = rated[0] if rated else 0
+
+        ratings = {player_id: [games, wins, elo, mu, sigma] for player_id, games, wins, elo, mu, sigma
+                   in self.db.execute("SELECT id, games, wins, elo, mu, sigma FROM players")}
+        rows = self.db.execute("SELECT g.id, g.winner, s.player_id FROM games g JOIN seats s ON s.game_id = g.id "
+                               "WHERE g.id > ? ORDER BY g.id, s.seat", (rated,))
+
+        count = 0
+        last_id = rated
+        for (game_id, winner), seats in groupby(rows, key=lambda row: (row[0], row[1])):
+            player_ids = [row[2] for row in seats]
+            # Seats sharing a player are one side of the game
+            sides = list(dict.fromkeys(player_ids))
+            if winner is not None:
+                winner = sides.index(player_ids[winner])
+            self.rate_game([ratings[player_id] for player_id in sides], winner)
+            count += 1
+            last_id = game_id
+
+        with self.db:
+            self.db.executemany("UPDATE players SET games = ?, wins = ?, elo = ?, mu = ?, sigma = ? WHERE id = ?",
+                                [(*values, player_id) for player_id, values in ratings.items()])
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rated_game', ?)", (last_id,))
+        return count
+
+    def recompute_ratings(self):
+        """Reset every rating and rate all the games again from the first one"""
+        with self.db:
+            self.db.execute(f"UPDATE players SET games = 0, wins = 0, elo = {ELO_START}, "
+                            f"mu = {TRUESKILL_MU}, sigma = {TRUESKILL_SIGMA}")
+            self.db.execute("DELETE FROM meta WHERE key = 'rated_game'")
+        return self.update_ratings()
+
+    @staticmethod
+    def rate_game(seats, winner):
+        """Update the [games, wins, elo, mu, sigma] lists of one game's sides in place, one list per player"""
+        if len(seats) < 2:
+            # A player against themself, nobody to be rated against
+            seats[0][0] += 1
+            if winner is not None:
+                seats[0][1] += 1
+            return
+        if winner is None:
+            # Blocked game, a draw between every pair
+            pairs = [(a, b) for a in range(len(seats)) for b in range(a + 1, len(seats))]
+        else:
+            pairs = [(winner, b) for b in range(len(seats)) if b != winner]
+            seats[winner][1] += 1
+        k = ELO_K / (len(seats) - 1)
+        draw = winner is None
+
+        elo = [rating[2] for rating in seats]
+        mu = [rating[3] for rating in seats]
+        # Skill uncertainty grows a little between games
+        sigma = [math.sqrt(rating[4] * rating[4] + TRUESKILL_TAU * TRUESKILL_TAU) for rating in seats]
+        new_elo = list(elo)
+        new_mu = list(mu)
+        new_sigma = list(sigma)
+        # Each pair is rated from the ratings before the game
+        for a, b in pairs:
+            change = elo_pair(elo[a], elo[b], draw, k)
+            new_elo[a] += change
+            new_elo[b] -= change
+            mu_a, sigma_a, mu_b, sigma_b = trueskill_pair(mu[a], sigma[a], mu[b], sigma[b], draw)
+            new_mu[a] += mu_a - mu[a]
+            new_mu[b] += mu_b - mu[b]
+            new_sigma[a] *= sigma_a / sigma[a]
+            new_sigma[b] *= sigma_b / sigma[b]
+
+        for n, rating in enumerate(seats):
+            rating[0] += 1
+            rating[2] = new_elo[n]
+            rating[3] = new_mu[n]
+            rating[4] = new_sigma[n]
+
+    def leaderboard(self, by="elo", limit=10, offset=0):
+        """Get the top players as (rank, name, rating, games, wins), by "elo" or "trueskill" """
+        order = RATING_ORDER[by]
+        rows = self.db.execute(f"SELECT name, {order}, games, wins FROM players "
+                               f"ORDER BY {order} DESC LIMIT ? OFFSET ?", (limit, offset))
+        return [(offset + n + 1, *row) for n, row in enumerate(rows)]
+
+    def player_rank(self, name, by="elo"):
+        """Get (rank, rating) of one player, or None if they haven't played"""
+        order = RATING_ORDER[by]
+        row = self.db.execute(f"SELECT {order} FROM players WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        better = self.db.execute(f"SELECT COUNT(*) FROM players WHERE {order} > ?", row).fetchone()[0]
+        return better + 1, row[0]
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def benchmark(games=1_000_000, player_pool=1000, seats=4, path='results_benchmark.db'):
+    """Time ingesting random results, rating them and querying the leaderboards"""
+    import os
+    import random
+    import statistics
+    import time
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    # Players with a hidden strength so the ratings have something to find
+    rng = random.Random(0)
+    names = [f"bot{n:04d}" for n in range(player_pool)]
+    strength = {name: rng.gauss(0, 1) for name in names}
+    results = []
+    for _ in range(games):
+        players = rng.sample(names, seats)
+        if rng.random() < 0.2:
+            winner = None
+        else:
+            scores = [strength[name] + rng.gauss(0, 1.5) for name in players]
+            winner = scores.index(max(scores))
+        results.append(GameResult(players, winner, "blocked" if winner is None else "domino", rng.randint(20, 40), 6))
+
+    print("=== RESULTS STORE BENCHMARK ===")
+    with ResultsStore(path, batch_size=50_000) as store:
+        start = time.perf_counter()
+        store.add_games(results)
+        store.flush()
+        ingest = time.perf_counter() - start
+        print(f"Ingest:    {games:,} games in {ingest:.2f} s ({games / ingest:,.0f} games/s)")
+
+        start = time.perf_counter()
+        rated = store.recompute_ratings()
+        rating = time.perf_counter() - start
+        print(f"Ratings:   {rated:,} games in {rating:.2f} s ({rated / rating:,.0f} games/s)")
+
+        for by in RATING_ORDER:
+            times = []
+            for _ in range(1000):
+                start = time.perf_counter()
+                store.leaderboard(by, 10)
+                times.append(time.perf_counter() - start)
+            top = store.leaderboard(by, 3)
+            print(f"Top 10 by {by}: median {statistics.median(times) * 1e6:.0f} us, "
+                  f"leaders {', '.join(f'{name} ({strength[name]:+.2f})' for _, name, *_ in top)}")
+
+        times = []
+        for name in names[:1000]:
+            start = time.perf_counter()
+            store.player_rank(name)
+            times.append(time.perf_counter() - start)
+        print(f"Player rank: median {statistics.median(times) * 1e6:.0f} us")
+    print(f"Database: {os.path.getsize(path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    benchmark()
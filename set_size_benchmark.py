@@ -0,0 +1,94 @@
+"""
+Set size benchmark
+Shows how the cost of a turn and the memory of a game grow from a double-six
+(28 tiles) to a double-nine (55) and double-twelve (91) set, for the console
+engine and for the vectorized environment
+"""
+
+import random
+import time
+import tracemalloc
+
+from domino_game import DominoGame, tile_count
+
+SET_SIZES = (6, 9, 12)
+
+
+def engine_turn_cost(max_pip, games=300, player_count=4):
+    """Get (microseconds per turn, turns per game) for quiet DominoGame play"""
+    turns = 0
+    def count_turn(event_type, data):
+        nonlocal turns
+        if event_type in ("tile_played", "pass"):
+            turns += 1
+
+    random.seed(max_pip)
+    seconds = 0.0
+    for _ in range(games):
+        game = DominoGame(max_pip, player_count)
+        game.verbose = False
+        game.turn_delay = 0
+        game.event_listeners.append(count_turn)
+        game.setup_game()
+
+        start = time.perf_counter()
+        game.start_game()
+        seconds += time.perf_counter() - start
+    return seconds / turns * 1e6, turns / games
+
+
+def engine_game_bytes(max_pip, games=200, player_count=4):
+    """Get the memory held by one set up DominoGame"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = []
+    for _ in range(games):
+        game = DominoGame(max_pip, player_count)
+        game.setup_game()
+        kept.append(game)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / games
+
+
+def env_figures(max_pip, num_envs=1024, steps=200):
+    """Get (steps per second, state bytes per game) for DominoVecEnv"""
+    import numpy as np
+    from domino_env import DominoVecEnv
+
+    env = DominoVecEnv(max_pip, seed=max_pip)
+    obs = env.reset(num_envs)
+    rng = np.random.default_rng(max_pip)
+    scores = np.empty((num_envs, env.action_count))
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        rng.random(out=scores)
+        scores *= obs["legal_actions"]
+        obs, rewards, dones = env.step(scores.argmax(axis=1))
+    seconds = time.perf_counter() - start
+
+    arrays = [env.owner, env.ends, env.seat, env.passes_in_row, env.pass_suits, env.done]
+    arrays += list(obs.values())
+    state_bytes = sum(array.nbytes for array in arrays) / num_envs
+    return num_envs * steps / seconds, state_bytes
+
+
+def benchmark_set_sizes():
+    print("=== SET SIZE BENCHMARK ===")
+    print(f"{'set':>10}  {'tiles':>5}  {'us/turn':>8}  {'turns':>6}  {'bytes/game':>10}  {'env steps/s':>12}  {'env bytes':>9}")
+
+    for max_pip in SET_SIZES:
+        turn_us, turns = engine_turn_cost(max_pip)
+        game_bytes = engine_game_bytes(max_pip)
+        try:
+            steps_per_second, env_bytes = env_figures(max_pip)
+            env_text = f"{steps_per_second:>12,.0f}  {env_bytes:>9.0f}"
+        except ImportError:
+            env_text = f"{'(no numpy)':>12}  {'':>9}"
+
+        print(f"{'double-' + str(max_pip):>10}  {tile_count(max_pip):>5}  {turn_us:>8.1f}  {turns:>6.1f}  {game_bytes:>10.0f}  {env_text}")
+
+
+if __name__ == "__main__":
+    benchmark_set_sizes()
@@ -0,0 +1,234 @@
+"""
+Spectator broadcast
+A SpectatorHub follows one DominoGame and encodes every turn once as a 7 byte
+delta (tile and orientation, side, player, or a pass) straight into a
+preallocated buffer that every watcher reads from. Nothing is copied per
+watcher: pull spectators read all new deltas as one memoryview slice of the
+shared buffer, push spectators get a callback with a view of the new delta.
+Watchers that join late get a compact snapshot (hand counts and the line of
+pips on the board) and carry on from the deltas after it.
+
+BoardState decodes both, so a watcher can rebuild the board line that
+DominoGame.display_board shows
+"""
+
+import struct
+import threading
+
+# seq, kind, player, left, right, side
+DELTA = struct.Struct('<HBBBBB')
+KIND_TILE = 0
+KIND_PASS = 1
+KIND_GAME_OVER = 2
+
+# Tiles carry left/right as they read on the board, so the orientation comes for free
+SIDES = ("start", "left", "right")
+# A game over delta keeps the reason in the left field and the winner in player
+REASONS = ("domino", "blocked", "turn_limit")
+NO_PLAYER = 255
+
+# seq, player count, line length, game over, winner, then hand counts and line pips
+SNAPSHOT = struct.Struct('<HBBBB')
+
+
+class BoardState:
+    """The board as a spectator sees it, built from a snapshot and deltas"""
+
+    def __init__(self, hand_counts=()):
+        self.seq = 0
+        self.hand_counts = list(hand_counts)
+        self.line = []           # Pips along the board, tile n is line[n] - line[n + 1]
+        self.game_over = False
+        self.winner = None
+        self.reason = None
+        self.last_player = None
+
+    def apply(self, data):
+        """Apply one or more deltas (any bytes-like object holding whole deltas)"""
+        for seq, kind, player, left, right, side in DELTA.iter_unpack(data):
+            self.seq = seq + 1
+            if kind == KIND_TILE:
+                self.last_player = player
+                self.hand_counts[player] -= 1
+                if side == 0:
+                    self.line = [left, right]
+                elif side == 1:
+                    self.line.insert(0, left)
+                else:
+                    self.line.append(right)
+            elif kind == KIND_PASS:
+                self.last_player = player
+            else:
+                self.game_over = True
+                self.winner = None if player == NO_PLAYER else player
+                self.reason = REASONS[left]
+
+    def encode_snapshot(self):
+        """Get the state as compact bytes for a late joiner"""
+        header = SNAPSHOT.pack(self.seq, len(self.hand_counts), len(self.line), self.game_over,
+                               NO_PLAYER if self.winner is None else self.winner)
+        return header + bytes(self.hand_counts) + bytes(self.line)
+
+    @classmethod
+    def from_snapshot(cls, data):
+        seq, player_count, line_length, game_over, winner = SNAPSHOT.unpack_from(data)
+        state = cls(data[SNAPSHOT.size:SNAPSHOT.size + player_count])
+        state.seq = seq
+        start = SNAPSHOT.size + player_count
+        state.line = list(data[start:start + line_length])
+        state.game_over = bool(game_over)
+        state.winner = None if winner == NO_PLAYER else winner
+        return state
+
+    def board_text(self):
+        """The board line the way DominoGame.display_board writes it"""
+        return ' '.join(f"| {left} | {right} |" for left, right in zip(self.line, self.line[1:]))
+
+
+class Spectator:
+    """One watcher, reads the hub's deltas from where it last stopped"""
+
+    def __init__(self, hub, seq, snapshot, callback=None):
+        self.hub = hub
+        self.cursor = seq
+        self.snapshot = snapshot
+        self.callback = callback
+
+    def poll(self):
+        """Get every delta published since the last poll as one shared memoryview (maybe empty)"""
+        end = self.hub.count
+        view = self.hub.view[self.cursor * DELTA.size:end * DELTA.size]
+        self.cursor = end
+        return view
+
+
+class SpectatorHub:
+    def __init__(self, game):
+        # game must already be set up (setup_game), attach the hub before start_game
+        self.player_count = game.player_count
+        # Every turn plus the opening double and the game over
+        capacity = game.turn_limit() + 2
+        self.buffer = bytearray(capacity * DELTA.size)
+        self.view = memoryview(self.buffer)
+        self.count = 0
+        self.lock = threading.Lock()
+        self.state = BoardState(player.tiles_assigned for player in game.players)
+        self.snapshot_cache = None
+        self.push = []
+        game.event_listeners.append(self.on_event)
+
+    def subscribe(self, callback=None):
+        """
+        Add a watcher. Without a callback it reads deltas with poll(), with one
+        callback(view) is called on the engine's thread for every new delta.
+        The spectator's snapshot holds everything before its first delta
+        """
+        with self.lock:
+            spectator = Spectator(self, self.count, self.snapshot(), callback)
+            if callback is not None:
+                self.push.append(spectator)
+        return spectator
+
+    def unsubscribe(self, spectator):
+        with self.lock:
+            if spectator in self.push:
+                self.push.remove(spectator)
+
+    def snapshot(self):
+        """Get the current snapshot, encoded once per turn however many join"""
+        cached = self.snapshot_cache
+        if cached is None or cached[0] != self.count:
+            cached = self.snapshot_cache = (self.count, self.state.encode_snapshot())
+        return cached[1]
+
+    def on_event(self, event_type, data):
+        """Game event listener, encodes the turn and hands it to every watcher"""
+        if event_type == "tile_played":
+            self.publish(KIND_TILE, data["player"], data["left"], data["right"], SIDES.index(data["side"]))
+        elif event_type == "pass":
+            self.publish(KIND_PASS, data["player"], 0, 0, 0)
+        elif event_type == "game_over":
+            winner = NO_PLAYER if data["winner"] is None else data["winner"]
+            self.publish(KIND_GAME_OVER, winner, REASONS.index(data["reason"]), 0, 0)
+
+    def publish(self, kind, player, left, right, side):
+        with self.lock:
+            seq = self.count
+            offset = seq * DELTA.size
+            DELTA.pack_into(self.buffer, offset, seq, kind, player, left, right, side)
+            delta = self.view[offset:offset + DELTA.size]
+            self.state.apply(delta)
+            # Poll readers can only see it once it's complete
+            self.count = seq + 1
+            push = list(self.push)
+        for spectator in push:
+            spectator.cursor = seq + 1
+            spectator.callback(delta)
+
+
+def load_test(watchers=10_000, games=5, seed=0):
+    """Time fanning each turn out to many watchers, each one keeping its own BoardState"""
+    import random
+    import statistics
+    import time
+    from domino_game import DominoGame
+
+    random.seed(seed)
+    print("=== SPECTATOR LOAD TEST ===")
+    print(f"{watchers:,} watchers, {games} games")
+
+    pull_times = []
+    push_times = []
+    delta_bytes = 0
+    board_bytes = 0
+    for _ in range(games):
+        game = DominoGame()
+        game.verbose = False
+        game.turn_delay = 0
+        game.setup_game()
+        hub = SpectatorHub(game)
+
+        # Half pull and half push, every one decoding into its own board
+        pullers = []
+        for _ in range(watchers // 2):
+            spectator = hub.subscribe()
+            pullers.append((spectator, BoardState.from_snapshot(spectator.snapshot)))
+        for _ in range(watchers - watchers // 2):
+            state = BoardState.from_snapshot(hub.snapshot())
+            hub.subscribe(state.apply)
+
+        # Drive the game one turn at a time so the fan-out can be timed per turn
+        def timed_turn(event_type, data):
+            nonlocal delta_bytes, board_bytes
+            delta_bytes += DELTA.size
+            board_bytes += len(' '.join(game.board)) + 1
+
+        game.event_listeners.append(timed_turn)
+        start_hub = hub.on_event
+        def timed_on_event(event_type, data):
+            start = time.perf_counter()
+            start_hub(event_type, data)
+            push_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for spectator, state in pullers:
+                state.apply(spectator.poll())
+            pull_times.append(time.perf_counter() - start)
+        game.event_listeners[game.event_listeners.index(start_hub)] = timed_on_event
+        game.start_game()
+
+        late = BoardState.from_snapshot(hub.snapshot())
+        assert late.board_text() == ' '.join(game.board)
+        assert all(state.board_text() == late.board_text() for _, state in pullers[:10])
+
+    for name, times in (("push", push_times), ("pull", pull_times)):
+        times = sorted(times)
+        print(f"{name} fan-out to {watchers // 2:,}: median {statistics.median(times) * 1e3:.2f} ms, "
+              f"p95 {times[int(len(times) * 0.95)] * 1e3:.2f} ms per turn")
+    print(f"Sent per watcher per turn: {delta_bytes / len(push_times):.0f} bytes as deltas, "
+          f"{board_bytes / len(push_times):.0f} bytes as the full board line")
+    print(f"Late join snapshot: {len(hub.snapshot())} bytes")
+
+
+if __name__ == "__main__":
+    load_test()
@@ -0,0 +1,79 @@
+"""
+Startup benchmark for the domino engine
+Imports domino_game in fresh interpreters, compares the start up time with a
+bare interpreter and fails (exit code 1) if the import goes over its budget or
+pulls in modules that should only load when they are used
+"""
+
+import py_compile
+import subprocess
+import statistics
+import sys
+import time
+
+# Budget for `import domino_game` itself, as reported by python -X importtime
+IMPORT_BUDGET_MS = 2.0
+
+# Modules the engine must not import just by being imported
+DEFERRED_MODULES = ("PIL", "kivy", "random", "argparse", "board_layout", "tile_loader", "game_worker", "profiler",
+                    "sqlite3", "results_store")
+
+RUNS = 20
+
+
+def time_interpreter(code, runs=RUNS):
+    """Get the median wall time (ms) of running code in a fresh interpreter"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def import_time_ms(module, runs=RUNS):
+    """Get the median cumulative import time (ms) of a module from -X importtime"""
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = [part.strip() for part in line.split('|')]
+            if len(parts) == 3 and parts[2] == module:
+                times.append(int(parts[1]) / 1000)
+    return statistics.median(times)
+
+
+def loaded_deferred_modules(module):
+    """Get the deferred modules that are loaded straight after importing module"""
+    code = (f"import sys, {module}; "
+            f"print(' '.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def benchmark_startup(budget_ms=IMPORT_BUDGET_MS):
+    """Print the start up figures, returns True when the engine is within budget"""
+    print("=== ENGINE STARTUP BENCHMARK ===")
+
+    # Measure a normal start with the bytecode already cached
+    py_compile.compile("domino_game.py")
+
+    bare = time_interpreter("pass")
+    engine = time_interpreter("import domino_game")
+    cumulative = import_time_ms("domino_game")
+    loaded = loaded_deferred_modules("domino_game")
+
+    print(f"Bare interpreter:        {bare:7.2f} ms")
+    print(f"Interpreter + engine:    {engine:7.2f} ms")
+    print(f"import domino_game:      {cumulative:7.2f} ms (budget {budget_ms:.2f} ms)")
+    print(f"Deferred modules loaded: {', '.join(loaded) if loaded else 'none'}")
+
+    ok = cumulative <= budget_ms and not loaded
+    print("PASS" if ok else "FAIL")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if benchmark_startup() else 1)
@@ -0,0 +1,72 @@
+"""
+Checks that DominoVecEnv plays by the same rules as DominoGame: the same dealt
+hands, with the agent playing the engine's first-valid-tile rule, have to end
+the same way in both
+"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from domino_game import DominoGame
+from domino_env import AGENT, BONEYARD, LEFT, RIGHT, DominoVecEnv
+
+GAMES = 300
+
+
+def engine_outcome(game):
+    """Play a dealt DominoGame quietly and get its reward for seat 1 (1 win, -1 loss, 0 blocked)"""
+    results = []
+    game.event_listeners.append(lambda event_type, data: results.append(data) if event_type == "game_over" else None)
+    game.start_game()
+    winner = results[0]["winner"]
+    if winner is None:
+        return 0
+    return 1 if winner == AGENT else -1
+
+
+def engine_action(env, obs):
+    """The agent's action for every game, the way DominoGame.play_tile would play it"""
+    legal = obs["legal_actions"].reshape(len(obs["hand"]), env.tile_count, 2)
+    tiles = legal.any(axis=2).argmax(axis=1)
+    sides = np.where(env.suit_tiles[obs["ends"][:, 0], tiles], LEFT, RIGHT)
+    return tiles * 2 + sides
+
+
+@pytest.mark.parametrize("max_pip, player_count", [(6, 4), (6, 2), (9, 4)])
+def test_env_matches_engine(max_pip, player_count):
+    random.seed(max_pip * 10 + player_count)
+    games = []
+    owner = []
+    for _ in range(GAMES):
+        game = DominoGame(max_pip, player_count)
+        game.verbose = False
+        game.turn_delay = 0
+        game.setup_game()
+        games.append(game)
+        owner.append([seat - 1 if seat else BONEYARD for seat in game.owners])
+
+    env = DominoVecEnv(max_pip, player_count, seed=0)
+    env.reset(GAMES)
+    env.start(env.all_envs, np.array(owner, dtype=np.int8))
+
+    # Games without a double or finished before the agent moves are decided already
+    outcome = np.where(env.done, env.rewards, np.nan)
+    # They get new games so every game has a legal action for step()
+    env.deal(np.flatnonzero(env.done))
+    env.write_obs()
+    obs = env.obs
+    while np.isnan(outcome).any():
+        obs, rewards, dones = env.step(engine_action(env, obs))
+        finished = dones & np.isnan(outcome)
+        outcome[finished] = rewards[finished]
+
+    expected = []
+    for game in games:
+        if game.find_starting_double()[0] is None:
+            expected.append(0)
+        else:
+            expected.append(engine_outcome(game))
+    assert outcome.tolist() == expected
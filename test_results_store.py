@@ -0,0 +1,53 @@
+"""
+Checks the ratings of ResultsStore, in particular games where copies of one
+strategy take several seats
+"""
+
+from results_store import ELO_START, GameResult, ResultsStore
+
+
+def ratings(store):
+    return {name: (games, wins, elo, mu) for name, games, wins, elo, mu
+            in store.db.execute("SELECT name, games, wins, elo, mu FROM players")}
+
+
+def test_shared_name_is_rated_once(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        store.add_game(GameResult(['first_valid', 'first_valid', 'random', 'random'], 0, "domino", 30, 6))
+        store.update_ratings()
+        after = ratings(store)
+    games, wins, elo, mu = after['first_valid']
+    assert (games, wins) == (1, 1)
+    assert elo > ELO_START
+    assert after['random'][:2] == (1, 0)
+    assert after['random'][2] < ELO_START
+
+
+def test_winner_rating_never_goes_down(tmp_path):
+    seatings = [
+        ['a', 'b', 'c', 'd'],
+        ['a', 'a', 'b', 'b'],
+        ['a', 'b', 'a', 'c'],
+        ['b', 'a', 'b', 'b'],
+        ['a', 'b'],
+    ]
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        for players in seatings:
+            for winner in range(len(players)):
+                store.add_game(GameResult(players, winner, "domino", 30, 6))
+                before = ratings(store)
+                store.update_ratings()
+                after = ratings(store)
+                name = players[winner]
+                if name in before:
+                    assert after[name][2] >= before[name][2]
+                    assert after[name][3] >= before[name][3]
+                assert after[name][1] == before.get(name, (0, 0))[1] + 1
+
+
+def test_self_play_only_counts_the_game(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        store.add_game(GameResult(['solo', 'solo'], 1, "domino", 30, 6))
+        store.update_ratings()
+        games, wins, elo, mu = ratings(store)['solo']
+    assert (games, wins, elo) == (1, 1, ELO_START)
@@ -0,0 +1,180 @@
+"""
+Lazy tile image loader
+Decodes each tile image on first use and keeps the decoded images (and any
+rotated or flipped copies) in an LRU cache with a byte budget, so the board
+never has to open the same PNG twice
+"""
+
+from PIL import Image
+from collections import OrderedDict
+import threading
+
+# Default cache budget, all 28 tiles at 1x in every rotation fit in about 8 MB
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Image.transpose() operations for each supported rotation (degrees, counter-clockwise)
+ROTATIONS = {
+    0: None,
+    90: Image.ROTATE_90,
+    180: Image.ROTATE_180,
+    270: Image.ROTATE_270,
+}
+
+
+def load_tile_mappings():
+    """Get {scale: {(left, right): filename}} from the generated tile_mappings.py"""
+    try:
+        import tile_mappings
+    except ImportError:
+        print("Error: tile_mappings.py not found! Run the cropping tool first")
+        return {}
+
+    # Older mapping files only have the 1x TILE_IMAGES table
+    by_scale = getattr(tile_mappings, 'TILE_IMAGES_BY_SCALE', None)
+    if by_scale is None:
+        by_scale = {1: tile_mappings.TILE_IMAGES}
+    return by_scale
+
+
+def image_bytes(image):
+    """Approximate decoded size of an image in bytes"""
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+class TileImageLoader:
+    def __init__(self, tile_images=None, max_bytes=DEFAULT_MAX_BYTES):
+        # tile_images is {scale: {(left, right): filename}}
+        self.tile_images = tile_images if tile_images is not None else load_tile_mappings()
+        self.max_bytes = max_bytes
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_loads = 0
+
+    def get(self, left, right, rotation=0, flip=False, scale=1):
+        """Get the decoded image for a tile, rotated and/or flipped left to right"""
+        rotation %= 360
+        if rotation not in ROTATIONS:
+            raise ValueError(f"Unsupported rotation: {rotation}")
+
+        images = self.tile_images.get(scale, {})
+        if (left, right) not in images and (right, left) in images:
+            # A 2-5 tile is the 5-2 image turned upside down, cached only under 5-2
+            # (a half turn and a left to right flip give the same image in either order)
+            left, right, rotation = right, left, (rotation + 180) % 360
+
+        key = (left, right, rotation, flip, scale)
+        with self.lock:
+            image = self.cache.get(key)
+            if image is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        if rotation == 0 and not flip:
+            image = self.decode(left, right, scale)
+        else:
+            # Build the variant from the cached upright image
+            image = self.get(left, right, 0, False, scale)
+            if flip:
+                image = image.transpose(Image.FLIP_LEFT_RIGHT)
+            if ROTATIONS[rotation] is not None:
+                image = image.transpose(ROTATIONS[rotation])
+
+        self.store(key, image)
+        return image
+
+    def decode(self, left, right, scale):
+        """Open and decode a tile image from disk"""
+        images = self.tile_images.get(scale, {})
+        filename = images.get((left, right))
+        if filename is None:
+            raise KeyError(f"No image for tile {left}-{right} at scale {scale}")
+
+        with Image.open(filename) as image:
+            image.load()
+            with self.lock:
+                self.disk_loads += 1
+            return image.copy()
+
+    def store(self, key, image):
+        """Add an image to the cache and evict the least recently used ones over budget"""
+        size = image_bytes(image)
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.cache:
+                return
+            self.cache[key] = image
+            self.cache_bytes += size
+            while self.cache_bytes > self.max_bytes:
+                _, evicted = self.cache.popitem(last=False)
+                self.cache_bytes -= image_bytes(evicted)
+                self.evictions += 1
+
+    def preload(self, rotations=(0,), scale=1, background=True):
+        """Decode every tile (and rotations) ahead of time, optionally in a background thread"""
+        def warm_up():
+            for left, right in list(self.tile_images.get(scale, {})):
+                for rotation in rotations:
+                    self.get(left, right, rotation, False, scale)
+
+        if not background:
+            warm_up()
+            return None
+
+        thread = threading.Thread(target=warm_up, name="tile-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self):
+        """Drop every cached image"""
+        with self.lock:
+            self.cache.clear()
+            self.cache_bytes = 0
+
+    def stats(self):
+        """Get the cache counters"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_loads": self.disk_loads,
+                "entries": len(self.cache),
+                "bytes": self.cache_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_default_loader = None
+
+def get_loader():
+    """Get the shared loader used by load_tile_image()"""
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = TileImageLoader()
+    return _default_loader
+
+def load_tile_image(left, right, rotation=0, flip=False, scale=1):
+    """Get the decoded image for a domino tile from the shared loader"""
+    return get_loader().get(left, right, rotation, flip, scale)
+
+
+if __name__ == "__main__":
+    print("Tile Image Loader")
+    print("=" * 40)
+
+    loader = get_loader()
+    loader.preload(rotations=(0, 90, 180, 270), background=False)
+    print(f"After preload: {loader.stats()}")
+
+    # A second pass should be served entirely from the cache
+    loader.preload(rotations=(0, 90, 180, 270), background=False)
+    print(f"After second pass: {loader.stats()}")